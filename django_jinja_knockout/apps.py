@@ -7,6 +7,11 @@ class DjkAppConfig(AppConfig):
     name = 'django_jinja_knockout'
     djk_middleware = None
 
+    def ready(self):
+        if getattr(settings, 'DJK_TRACK_MODEL_VERSIONS', True):
+            from .models import track_model_versions
+            track_model_versions()
+
     @classmethod
     def get_context_middleware(cls):
         if cls.djk_middleware is None:
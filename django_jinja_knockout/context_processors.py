@@ -159,6 +159,11 @@ class PageContext:
         self.add_client_routes({
             url_name for url_name, is_anon in getattr(settings, 'DJK_CLIENT_ROUTES', {}) if is_anon or user_id != 0
         })
+        # Url name of ActionsBatchView, used by client-side Actions class to coalesce AJAX requests.
+        actions_batch_route = getattr(settings, 'DJK_ACTIONS_BATCH_ROUTE', None)
+        if actions_batch_route is not None:
+            client_conf['actionsBatchRoute'] = actions_batch_route
+            self.add_client_routes({actions_batch_route})
 
         self.request_viewmodels()
         client_conf.setdefault('url', self.get_client_urls())
@@ -96,6 +96,8 @@ class ChoicesFilter(MultiFilter):
             'text': choice_def['name'],
             'atts': {}
         }
+        if 'count' in choice_def:
+            link['count'] = choice_def['count']
         if is_added is not False:
             if is_added is None:
                 curr_list_filter[self.fieldname] = choice_def['value']
@@ -172,6 +174,8 @@ class ChoicesFilter(MultiFilter):
             }
             if value in filter_def['active_choices']:
                 choice['is_active'] = True
+            if self.view.facet_counts:
+                choice['count'] = self.view.get_facet_count(self.fieldname, value)
             vm_choices.append(choice)
         self.vm_filter['choices'] = vm_choices
         return super().build(filter_def)
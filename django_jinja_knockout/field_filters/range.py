@@ -1,6 +1,7 @@
 from copy import deepcopy
 
 from django.core.exceptions import ValidationError
+from django.utils.formats import localize_input
 
 from .. import tpl
 
@@ -76,6 +77,11 @@ class RangeFilter(BaseFilter):
         tpl.add_css_classes_to_dict(from_input_attrs, 'input-from')
         tpl.add_css_classes_to_dict(to_input_attrs, 'input-to')
         filter_values = self.get_values(curr_list_filter)
+        # Bounds of field values, see BaseFilterView.range_stats.
+        stats = self.vm_filter.get('stats')
+        if stats is not None and stats['min'] is not None:
+            from_input_attrs['placeholder'] = localize_input(stats['min'])
+            to_input_attrs['placeholder'] = localize_input(stats['max'])
         if 'from' in filter_values:
             from_input_attrs['value'] = filter_values['from']
             collapse_class += self.in_show_class
@@ -98,6 +104,7 @@ class RangeFilter(BaseFilter):
             'from_input_attrs': from_input_attrs,
             'to_input_attrs': to_input_attrs,
             'errors': self.get_errors(),
+            'stats': stats,
             'apply_url_query': apply_url_query,
             'reset_url_query': reset_url_query,
         }
@@ -13,6 +13,7 @@ from ..templatetags.fields import (
     filter_get_display_layout, filter_is_checkbox, filter_is_multiple_checkbox, filter_is_radio
 )
 from .. import tpl
+from ..widgets import prefetch_grid_widgets
 
 from . import base
 
@@ -168,6 +169,7 @@ class FormFieldsRenderer(RelativeRenderer):
 
     def ioc_fields(self):
         field_classes = self.context.get('layout_classes', self.get_layout_classes())
+        prefetch_grid_widgets([self.obj])
         for field in self.obj.visible_fields():
             if not hasattr(field, 'djk_renderer'):
                 field.djk_renderer = self.ioc_render_field(field)
@@ -285,6 +287,7 @@ class FormsetRenderer(tpl.Renderer):
         )
 
     def ioc_forms(self, context):
+        prefetch_grid_widgets(self.obj)
         for idx, form in enumerate(self.obj):
             renderer = self.ioc_render_inline_form(form)
             renderer.update_context(context)
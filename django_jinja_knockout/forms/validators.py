@@ -1,4 +1,5 @@
 from collections import namedtuple
+from copy import copy
 
 from django import forms
 from django.core.exceptions import ValidationError
@@ -45,13 +46,35 @@ class FieldValidator:
         ),
     )
 
+    # Set to False when overridden .get_form_field() depends on the view / request.
+    cache_prototype = True
+    prototypes = {}
+
     def __init__(self, view, fieldname, model_class=None, model_field=None):
         self.view = view
-        if model_field is None:
-            self.model_field = get_related_field(view.model if model_class is None else model_class, fieldname)
+        if model_field is None and self.cache_prototype:
+            self.model_field, form_field, self.field_filter_type = self.get_prototype(
+                view.model if model_class is None else model_class, fieldname
+            )
+            # Form field is mutated by .set_auto_id() / .clean().
+            self.form_field = None if form_field is None else copy(form_field)
         else:
-            self.model_field = model_field
-        self.form_field, self.field_filter_type = self.get_form_field()
+            if model_field is None:
+                self.model_field = get_related_field(view.model if model_class is None else model_class, fieldname)
+            else:
+                self.model_field = model_field
+            self.form_field, self.field_filter_type = self.get_form_field()
+
+    # Resolved model field, form field and filter type are cached per validator class / model / field name,
+    # because validators are created for each filter field of each request.
+    def get_prototype(self, model_class, fieldname):
+        prototype_key = (self.__class__, model_class, fieldname)
+        prototype = self.prototypes.get(prototype_key)
+        if prototype is None:
+            self.model_field = get_related_field(model_class, fieldname)
+            prototype = (self.model_field,) + self.get_form_field()
+            self.prototypes[prototype_key] = prototype
+        return prototype
 
     def get_form_field(self):
         for model_field_type, field_filter_type, form_field_type in self.field_types:
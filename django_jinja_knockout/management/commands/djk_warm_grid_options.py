@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import get_resolver, reverse, resolve, NoReverseMatch, URLPattern, URLResolver
+from django.utils import translation
+
+from django_jinja_knockout.views.ajax import KoGridView
+from django_jinja_knockout import tpl
+
+
+class Command(BaseCommand):
+    # Django command help
+    help = 'Warm the cache of discovered grid options for KoGridView subclasses with .cache_grid_options = True.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'routes',
+            nargs='*',
+            help='Names of grid routes to warm. By default, all routes of KoGridView with .cache_grid_options = True.',
+        )
+        parser.add_argument(
+            '--languages',
+            action='store',
+            dest='languages',
+            default=None,
+            help='Comma-separated list of language codes (by default is the current language).',
+            type=str
+        )
+        parser.add_argument(
+            '--users',
+            action='store',
+            dest='users',
+            default='',
+            help='Comma-separated list of usernames to warm the options for, in addition to anonymous user.',
+            type=str
+        )
+
+    def yield_grid_routes(self, url_patterns, ns_prefix=''):
+        for pattern in url_patterns:
+            if isinstance(pattern, URLResolver):
+                inner_prefix = ns_prefix if pattern.namespace is None else f'{ns_prefix}{pattern.namespace}:'
+                yield from self.yield_grid_routes(pattern.url_patterns, inner_prefix)
+            elif isinstance(pattern, URLPattern) and pattern.name is not None:
+                view_cls = getattr(pattern.callback, 'view_class', None)
+                if isinstance(view_cls, type) and issubclass(view_cls, KoGridView) and view_cls.cache_grid_options:
+                    yield f'{ns_prefix}{pattern.name}'
+
+    def get_users(self, usernames):
+        users = [AnonymousUser()]
+        for username in usernames:
+            try:
+                users.append(get_user_model()._default_manager.get_by_natural_key(username))
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'User {username} does not exist')
+        return users
+
+    # Raises NoReverseMatch when the route requires url kwargs.
+    def get_route_path(self, route):
+        try:
+            return reverse(route, kwargs={'action': ''})
+        except NoReverseMatch:
+            return reverse(route)
+
+    def get_request(self, path, user):
+        request = RequestFactory().get(path)
+        request.resolver_match = resolve(path)
+        request.user = user
+        return request
+
+    def handle(self, *args, **options):
+        routes = options['routes'] if len(options['routes']) > 0 else list(self.yield_grid_routes(
+            get_resolver().url_patterns
+        ))
+        languages = [translation.get_language()] if options['languages'] is None \
+            else options['languages'].split(',')
+        users = self.get_users([username for username in options['users'].split(',') if username != ''])
+        for route in routes:
+            try:
+                path = self.get_route_path(route)
+            except NoReverseMatch:
+                self.stderr.write(f'Skipping route {route} which requires url kwargs')
+                continue
+            for language in languages:
+                with translation.override(language):
+                    for user in users:
+                        request = self.get_request(path, user)
+                        # Same grid_options as cbv_grid.htm passes to ko_grid() macro.
+                        tpl.discover_grid_options(request, {
+                            'pageRoute': route,
+                            'pageRouteKwargs': request.resolver_match.kwargs,
+                        })
+                        self.stdout.write(f'Warmed grid options of route {route}, language {language}, user {user}')
@@ -1,6 +1,11 @@
+import time
+
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.conf import settings
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
 from django.apps import apps
 from django.db import models
+from django.db.models import signals
 from django.db.models import Q
 from django.db.models.fields.related import ForeignObject, ForeignObjectRel
 from django.utils.translation import gettext_lazy as _
@@ -13,6 +18,11 @@ MANY_NONE_SINGLE_TRUE = (
     (True, _('Yes')),
 )
 
+# Expired model version is re-created with the new value, thus limits the lifetime of the data cached by version.
+MODEL_VERSION_TIMEOUT = getattr(settings, 'DJK_MODEL_VERSION_TIMEOUT', 86400)
+# Single cache alias of model versions, so the signal receivers bump the versions read by any cached data alias.
+MODEL_VERSION_CACHE_ALIAS = getattr(settings, 'DJK_MODEL_VERSION_CACHE_ALIAS', DEFAULT_CACHE_ALIAS)
+
 
 def normalize_fk_fieldname(fieldname):
     return fieldname[:-3] if fieldname.endswith('_id') else fieldname
@@ -59,6 +69,45 @@ def get_related_field(obj, fieldname):
     return related_obj._meta.get_field(fieldname)
 
 
+# Returns True when the lookup path spans reverse ForeignKey / ManyToManyField relation, thus the queryset rows joined
+# via such path may be duplicated.
+def is_multivalued_path(model, fieldname):
+    for _fieldname in fieldname.split('__'):
+        try:
+            field = model._meta.get_field(_fieldname)
+        except FieldDoesNotExist:
+            # 'pk', lookup / transform name or annotation.
+            return False
+        if field.one_to_many or field.many_to_many:
+            return True
+        if field.related_model is None:
+            return False
+        model = field.related_model
+    return False
+
+
+# Splits the relations spanned by the lookup path into select_related() path of forward ForeignKey / OneToOneField chain
+# and prefetch_related() path when the chain continues via reverse ForeignKey / ManyToManyField relation.
+def get_related_lookups(model, fieldname):
+    select_path = []
+    prefetch_path = None
+    for _fieldname in fieldname.split('__'):
+        try:
+            field = model._meta.get_field(_fieldname)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        if prefetch_path is None and (field.one_to_many or field.many_to_many):
+            prefetch_path = list(select_path)
+        if prefetch_path is None:
+            select_path.append(field.name)
+        else:
+            prefetch_path.append(field.get_accessor_name() if isinstance(field, ForeignObjectRel) else field.name)
+        model = field.related_model
+    return '__'.join(select_path), None if prefetch_path is None else '__'.join(prefetch_path)
+
+
 def get_meta(obj, meta_attr, fieldname=None):
     if fieldname is None:
         return getattr(obj._meta, meta_attr)
@@ -197,3 +246,36 @@ def wakeup_user(user):
             user._setup()
         user = user._wrapped
     return user
+
+
+def get_model_version_key(model):
+    # Proxy models share the data version of their concrete model.
+    return f'djk_model_version:{model._meta.concrete_model._meta.label_lower}'
+
+
+def bump_model_version(sender, **kwargs):
+    # Time-based value instead of incr(), so the evicted version will not be reused with the stale cached data.
+    caches[MODEL_VERSION_CACHE_ALIAS].set(get_model_version_key(sender), time.time_ns(), MODEL_VERSION_TIMEOUT)
+
+
+# ManyToManyField .add() / .remove() / .clear() change the data of both related models.
+def bump_m2m_model_versions(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        bump_model_version(instance._meta.model)
+        bump_model_version(model)
+
+
+# Connect model signals which bump the model data version. Called by DjkAppConfig.ready(), so the versions are bumped
+# by every process, including the ones which have not read any version yet.
+# Note that QuerySet.update() / .bulk_create() do not send signals, so cached data should have the limited timeout.
+def track_model_versions():
+    signals.post_save.connect(bump_model_version, weak=False, dispatch_uid='djk_model_version_post_save')
+    signals.post_delete.connect(bump_model_version, weak=False, dispatch_uid='djk_model_version_post_delete')
+    signals.m2m_changed.connect(bump_m2m_model_versions, weak=False, dispatch_uid='djk_model_version_m2m_changed')
+
+
+# Opaque value which is changed each time model instance is saved or deleted via signals.
+def get_model_version(model):
+    return caches[MODEL_VERSION_CACHE_ALIAS].get_or_set(
+        get_model_version_key(model), time.time_ns, MODEL_VERSION_TIMEOUT
+    )
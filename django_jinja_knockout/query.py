@@ -1,24 +1,42 @@
+import hashlib
+import json
+import numbers
 import operator
+import re
 import types
+from array import array
 from collections.abc import Mapping
 from distutils.version import LooseVersion
 from operator import attrgetter
 from copy import copy
+from functools import reduce
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from uuid import UUID
 from sqlparse.tokens import Token
 from sqlparse.lexer import tokenize
 
-from django.utils import version
-from django.core.exceptions import EmptyResultSet, FieldError, ObjectDoesNotExist, MultipleObjectsReturned
+from django.utils import timezone, version
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.exceptions import (
+    EmptyResultSet, FieldDoesNotExist, FieldError, ObjectDoesNotExist, MultipleObjectsReturned
+)
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.db import models
 from django.db.models.fields.files import FieldFile
 from django.db.models import signals
-from django.db.models import Aggregate, Count, Min, Max, Sum, Q
+from django.db.models import Aggregate, Count, Min, Max, Sum, F, Q
+from django.db.models.expressions import BaseExpression
 from django.db.models.fields import Field
 from django.db.models.sql.compiler import SQLCompiler
 from django.db.models.sql import RawQuery
 from django.db.models.query import RawQuerySet, QuerySet
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 try:
     from django.core.exceptions import FullResultSet
 except ImportError:
@@ -26,24 +44,44 @@ except ImportError:
     class FullResultSet(Exception):
         pass
 
-from .models import get_related_field_val
-
-
-class RichComparator:
-
-    def __init__(self, val):
-        self.val = val
-
-    def __lt__(self, other):
-        if self.val is None:
-            return other.val is not None
-        elif self.val is False:
-            return other.val is not False
-        else:
-            return str(self.val) < str(other.val)
-
-    def __eq__(self, other):
-        return self.val == other.val
+from .models import get_related_field, get_model_version
+
+
+# Type groups of the sort keys, which values are comparable to each other.
+SORT_KEY_GROUPS = {
+    bool: 0,
+    int: 0,
+    float: 0,
+    Decimal: 0,
+    str: 1,
+}
+
+
+# Type-aware sort key of the field value: None sorts first, then False, then the values grouped by type, so numbers and
+# dates are compared natively, while values of the different types do not raise TypeError.
+def get_sort_key(val):
+    if val is None:
+        return 0, 0, 0
+    elif val is False:
+        return 1, 0, 0
+    group = SORT_KEY_GROUPS.get(type(val))
+    if group is not None:
+        return 2, group, val
+    elif isinstance(val, models.Model):
+        return get_sort_key(val.pk)
+    elif isinstance(val, FieldFile):
+        return get_sort_key(val.name)
+    elif isinstance(val, numbers.Number) and not isinstance(val, complex):
+        return 2, 0, val
+    elif isinstance(val, str):
+        return 2, 1, val
+    elif isinstance(val, datetime):
+        # Naive and aware datetimes are not comparable.
+        return 2, 2 if val.tzinfo is None else 3, val
+    elif isinstance(val, (date, time, timedelta, UUID)):
+        return 2, 4, type(val).__name__, val
+    else:
+        return 2, 5, str(val)
 
 
 class RawSqlCompiler(SQLCompiler):
@@ -220,14 +258,19 @@ class ValuesQuerySetMixin:
                 try:
                     # Support for ordering by prefetched related queryset field:
                     # qs.order_by('-reverse_relation_list__field_name')
-                    value_qs = None
+                    related_list = None
                     if isinstance(value, ListQuerySet):
-                        value_qs = value
+                        related_list = value.list
                     elif isinstance(value, list):
-                        value_qs = ListQuerySet(value)
-                    if value_qs is not None:
-                        reverse_order = '-' if is_desc else ''
-                        value = getattr(value_qs.order_by(f"{reverse_order}{key}").first(), key)
+                        related_list = value
+                    if related_list is not None:
+                        # Min / max of the related values, computed in one pass over the prefetched list.
+                        if len(related_list) == 0:
+                            raise AttributeError(key)
+                        extreme_fn = max if is_desc else min
+                        value = getattr(extreme_fn(
+                            related_list, key=lambda related_obj: get_sort_key(getattr(related_obj, key))
+                        ), key)
                     else:
                         value = getattr(value, key)
                 except (AttributeError, ObjectDoesNotExist):
@@ -476,6 +519,10 @@ class FilteredRawQuerySet(ValuesQuerySetMixin, RawQuerySet):
 # To use with Prefetch() 'to_attr' keyword argument object results.
 class ListQuerySet(ValuesQuerySetMixin):
 
+    # Hash index of the field is built lazily when .filter() / .get() performs 'exact' / 'in' lookup of the same field
+    # more than auto_index_after times. Set to None to disable automatic indexes. See also .create_index().
+    auto_index_after = 1
+
     def __init__(self, lst):
         if isinstance(lst, ListQuerySet):
             self.list = copy(lst.list)
@@ -483,6 +530,79 @@ class ListQuerySet(ValuesQuerySetMixin):
             self.list = lst
         else:
             self.list = list(lst)
+        self.reset_indexes()
+
+    # Call after changing the values of indexed fields of the list objects.
+    def reset_indexes(self):
+        # fieldpath tuple: {field value: [positions in self.list]} or None for unindexable (unhashable) values.
+        self.indexes = {}
+        self.index_lookups = {}
+        self.indexed_list = (id(self.list), len(self.list))
+
+    def _build_index(self, fieldpath):
+        get_field_val = attrgetter('.'.join(fieldpath))
+        index = {}
+        for position, obj in enumerate(self.list):
+            try:
+                index.setdefault(get_field_val(obj), []).append(position)
+            except AttributeError:
+                # Such objects never match the lookup.
+                pass
+            except TypeError:
+                index = None
+                break
+        self.indexes[fieldpath] = index
+        return index
+
+    def create_index(self, *fieldnames):
+        self._check_indexes()
+        for fieldname in fieldnames:
+            self._build_index(tuple(fieldname.split('__')))
+        return self
+
+    # Indexes are invalidated when the list was replaced or resized.
+    def _check_indexes(self):
+        if self.indexed_list != (id(self.list), len(self.list)):
+            self.reset_indexes()
+
+    def _get_index(self, fieldpath):
+        self._check_indexes()
+        if fieldpath in self.indexes:
+            return self.indexes[fieldpath]
+        lookups = self.index_lookups.get(fieldpath, 0) + 1
+        self.index_lookups[fieldpath] = lookups
+        if self.auto_index_after is None or lookups <= self.auto_index_after:
+            return None
+        return self._build_index(fieldpath)
+
+    # Returns sorted positions of the objects, matching 'exact' / 'in' lookup, or None when index cannot be used.
+    def _probe_index(self, index, lookup, query_val):
+        try:
+            if lookup == 'exact':
+                return index.get(query_val, [])
+            else:
+                positions = []
+                for val in set(query_val):
+                    positions.extend(index.get(val, []))
+                positions.sort()
+                return positions
+        except TypeError:
+            return None
+
+    # Returns the list of candidate objects for AND-ed prepared kwargs lookups, using the most selective hash index,
+    # or None when there is no usable index.
+    def _get_index_candidates(self, prepared_lookups):
+        candidates = None
+        for fieldpath, transforms, lookup, query_val in prepared_lookups:
+            if len(transforms) > 0 or lookup not in ('exact', 'in'):
+                continue
+            index = self._get_index(tuple(fieldpath))
+            if index is None:
+                continue
+            positions = self._probe_index(index, lookup, query_val)
+            if positions is not None and (candidates is None or len(positions) < len(candidates)):
+                candidates = positions
+        return None if candidates is None else [self.list[position] for position in candidates]
 
     def _clone(self):
         c = self.__class__(
@@ -506,25 +626,136 @@ class ListQuerySet(ValuesQuerySetMixin):
                     sender=model, instance=obj, using=None
                 )
         self.list = []
+        self.reset_indexes()
 
-    def _match(self, key, query_val, obj):
-        if isinstance(key, str):
-            tokens = key.split('__')
+    # Lookups which are matched against None field value. Other lookups never match NULL, like in SQL.
+    _null_lookups = {'exact', 'isnull'}
+
+    # Returns the model class of the list items, or None when the list is empty or holds non-model items.
+    # Used to tell the related field names from the lookups / transforms.
+    def _get_model(self):
+        if len(self.list) > 0 and isinstance(self.list[0], models.Model):
+            return self.list[0]._meta.model
         else:
-            tokens = key
-        if len(tokens) == 1:
-            return hasattr(obj, tokens[0]) and getattr(obj, tokens[0]) == query_val
+            return None
+
+    def _is_field_path(self, model, tokens):
+        if model is None:
+            return False
+        try:
+            get_related_field(model, '__'.join(tokens))
+            return True
+        except (AttributeError, FieldDoesNotExist):
+            return False
+
+    # Splits lookup key into the field path, the list of transforms and the lookup name.
+    def _parse_lookup_key(self, key, model=None):
+        tokens = key.split('__') if isinstance(key, str) else list(key)
+        if len(tokens) == 1 or self._is_field_path(model, tokens):
+            return tokens, [], 'exact'
+        lookup = 'exact'
+        if callable(getattr(self, f'_match_{tokens[-1]}', None)):
+            lookup = tokens.pop()
+        transforms = []
+        while len(tokens) > 1 and callable(getattr(self, f'_transform_{tokens[-1]}', None)) and \
+                not self._is_field_path(model, tokens):
+            transforms.insert(0, tokens.pop())
+        return tokens, transforms, lookup
+
+    def _prepare_query_val(self, lookup, query_val):
+        if isinstance(query_val, (F, BaseExpression)):
+            raise NotImplementedError(f'ListQuerySet does not support expression {query_val!r}')
+        if lookup in ('iexact', 'icontains', 'istartswith', 'iendswith'):
+            return query_val.lower()
+        elif lookup == 'regex':
+            return re.compile(query_val)
+        elif lookup == 'iregex':
+            return re.compile(query_val, re.IGNORECASE)
+        elif lookup == 'in':
+            query_val = tuple(query_val)
+            try:
+                return frozenset(query_val)
+            except TypeError:
+                return query_val
         else:
-            match_method = getattr(self, f'_match_{tokens[-1]}', None)
+            return query_val
+
+    # Compiles the single lookup into predicate closure, so the lookup key is parsed only once per .filter() call.
+    # Returns (fieldpath, transforms, lookup, prepared query value) tuple. Query value is materialized here only once,
+    # thus one-shot iterables of 'in' lookup may be used both by the predicate and by the hash index.
+    def _prepare_lookup(self, key, query_val, model=None):
+        fieldpath, transforms, lookup = self._parse_lookup_key(key, model)
+        return fieldpath, transforms, lookup, self._prepare_query_val(lookup, query_val)
+
+    def _compile_lookup(self, key, query_val, model=None):
+        return self._compile_prepared_lookup(*self._prepare_lookup(key, query_val, model))
+
+    def _compile_prepared_lookup(self, fieldpath, transforms, lookup, query_val):
+        get_field_val = attrgetter('.'.join(fieldpath))
+        transform_fns = [getattr(self, f'_transform_{transform}') for transform in transforms]
+        match_method = getattr(self, f'_match_{lookup}')
+        matches_null = lookup in self._null_lookups
+
+        def predicate(obj):
             try:
-                if callable(match_method):
-                    field_val = get_related_field_val(obj, tokens[:-1])
-                    return match_method(field_val, query_val)
-                else:
-                    field_val = get_related_field_val(obj, tokens)
-                    return field_val == query_val
+                field_val = get_field_val(obj)
             except AttributeError:
                 return False
+            for transform_fn in transform_fns:
+                field_val = transform_fn(field_val)
+            if field_val is None and not matches_null:
+                return False
+            return match_method(field_val, query_val)
+
+        return predicate
+
+    # Compiles Q object tree with AND / OR / XOR connectors and negation into predicate closure.
+    def _compile_q(self, q, model=None):
+        predicates = [
+            self._compile_q(child, model) if isinstance(child, Q) else self._compile_lookup(*child, model=model)
+            for child in q.children
+        ]
+        if len(predicates) == 1:
+            predicate = predicates[0]
+        elif q.connector == Q.OR:
+            def predicate(obj):
+                for child_predicate in predicates:
+                    if child_predicate(obj):
+                        return True
+                return False
+        elif q.connector == getattr(Q, 'XOR', None):
+            def predicate(obj):
+                return sum(1 for child_predicate in predicates if child_predicate(obj)) % 2 == 1
+        else:
+            predicate = self._compile_and(predicates)
+        if q.negated:
+            def negated_predicate(obj):
+                return not predicate(obj)
+            return negated_predicate
+        else:
+            return predicate
+
+    def _compile_and(self, predicates):
+        if len(predicates) == 1:
+            return predicates[0]
+
+        def predicate(obj):
+            for child_predicate in predicates:
+                if not child_predicate(obj):
+                    return False
+            return True
+
+        return predicate
+
+    # args are Q objects, prepared_lookups are the results of ._prepare_lookup() for .filter() kwargs.
+    def _compile_filter(self, args, prepared_lookups, model=None):
+        predicates = [self._compile_prepared_lookup(*prepared_lookup) for prepared_lookup in prepared_lookups]
+        if len(args) > 0:
+            predicates.insert(0, self._compile_q(Q(*args), model))
+        return self._compile_and(predicates)
+
+    def _match(self, key, query_val, obj):
+        return self._compile_lookup(key, query_val)(obj)
 
     def _match_contains(self, field_val, query_val):
         return query_val in field_val
@@ -532,8 +763,9 @@ class ListQuerySet(ValuesQuerySetMixin):
     def _match_exact(self, field_val, query_val):
         return field_val == query_val
 
+    # query_val of case-insensitive lookups is lowercased by ._prepare_query_val().
     def _match_iexact(self, field_val, query_val):
-        return field_val.lower() == query_val.lower()
+        return field_val.lower() == query_val
 
     def _match_gt(self, field_val, query_val):
         return field_val > query_val
@@ -542,7 +774,7 @@ class ListQuerySet(ValuesQuerySetMixin):
         return field_val >= query_val
 
     def _match_icontains(self, field_val, query_val):
-        return query_val.lower() in field_val.lower()
+        return query_val in field_val.lower()
 
     def _match_isnull(self, field_val, query_val):
         return (field_val is None) is query_val
@@ -556,16 +788,89 @@ class ListQuerySet(ValuesQuerySetMixin):
     def _match_lte(self, field_val, query_val):
         return field_val <= query_val
 
+    def _match_startswith(self, field_val, query_val):
+        return field_val.startswith(query_val)
+
+    def _match_istartswith(self, field_val, query_val):
+        return field_val.lower().startswith(query_val)
+
+    def _match_endswith(self, field_val, query_val):
+        return field_val.endswith(query_val)
+
+    def _match_iendswith(self, field_val, query_val):
+        return field_val.lower().endswith(query_val)
+
+    def _match_range(self, field_val, query_val):
+        return query_val[0] <= field_val <= query_val[1]
+
+    # query_val of regex lookups is compiled by ._prepare_query_val().
+    def _match_regex(self, field_val, query_val):
+        return query_val.search(field_val) is not None
+
+    def _match_iregex(self, field_val, query_val):
+        return query_val.search(field_val) is not None
+
+    # Date / time transforms, for example 'created__year__gte'.
+    # Aware datetimes are converted to the current timezone, like Django database functions do.
+    def _localtime(self, field_val):
+        if isinstance(field_val, datetime) and timezone.is_aware(field_val):
+            return timezone.localtime(field_val)
+        else:
+            return field_val
+
+    def _transform_date(self, field_val):
+        field_val = self._localtime(field_val)
+        return field_val.date() if isinstance(field_val, datetime) else field_val
+
+    def _transform_year(self, field_val):
+        return None if field_val is None else self._localtime(field_val).year
+
+    def _transform_iso_year(self, field_val):
+        return None if field_val is None else self._localtime(field_val).isocalendar()[0]
+
+    def _transform_quarter(self, field_val):
+        return None if field_val is None else (self._localtime(field_val).month - 1) // 3 + 1
+
+    def _transform_month(self, field_val):
+        return None if field_val is None else self._localtime(field_val).month
+
+    def _transform_week(self, field_val):
+        return None if field_val is None else self._localtime(field_val).isocalendar()[1]
+
+    def _transform_day(self, field_val):
+        return None if field_val is None else self._localtime(field_val).day
+
+    # 1 is Sunday, 7 is Saturday.
+    def _transform_week_day(self, field_val):
+        return None if field_val is None else self._localtime(field_val).isoweekday() % 7 + 1
+
+    # 1 is Monday, 7 is Sunday.
+    def _transform_iso_week_day(self, field_val):
+        return None if field_val is None else self._localtime(field_val).isoweekday()
+
+    def _transform_hour(self, field_val):
+        return None if field_val is None else self._localtime(field_val).hour
+
+    def _transform_minute(self, field_val):
+        return None if field_val is None else self._localtime(field_val).minute
+
+    def _transform_second(self, field_val):
+        return None if field_val is None else self._localtime(field_val).second
+
+    # Filters are compiled once into predicate closure, then the list is evaluated in a single pass.
+    # Multiple arguments are AND-ed, thus .exclude(a=1, b=2) excludes objects matching both, like QuerySet.exclude().
     def _filter(self, positive, *args, **kwargs):
-        filtered_list = []
-        for obj in self.list:
-            matches = True
-            for key, val in kwargs.items():
-                if self._match(key, val, obj) is not positive:
-                    matches = False
-                    break
-            if matches:
-                filtered_list.append(obj)
+        if len(args) == 0 and len(kwargs) == 0:
+            return self._clone()
+        model = self._get_model()
+        prepared_lookups = [self._prepare_lookup(key, query_val, model) for key, query_val in kwargs.items()]
+        predicate = self._compile_filter(args, prepared_lookups, model)
+        if positive:
+            # Hash index only narrows the candidates, which are matched by the whole predicate.
+            candidates = self._get_index_candidates(prepared_lookups)
+            filtered_list = [obj for obj in (self.list if candidates is None else candidates) if predicate(obj)]
+        else:
+            filtered_list = [obj for obj in self.list if not predicate(obj)]
         return self.__class__(
             filtered_list
         )
@@ -582,15 +887,42 @@ class ListQuerySet(ValuesQuerySetMixin):
     def count(self):
         return len(self.list)
 
+    # Type-aware sort keys of the field, computed once per row.
+    # Descending field keys are inverted by replacing them with the negated ranks of the distinct keys.
+    def _get_sort_column(self, fieldname):
+        canon_name = fieldname.lstrip('-')
+        is_desc = fieldname.startswith('-')
+        column = None
+        if '__' not in canon_name:
+            # Model / FieldFile values of local fields are converted by get_sort_key(), no need of ._get_row_attr().
+            try:
+                column = list(map(get_sort_key, map(attrgetter(canon_name), self.list)))
+            except ObjectDoesNotExist:
+                pass
+        if column is None:
+            column = [get_sort_key(self._get_row_attr(row, canon_name, is_desc)) for row in self.list]
+        if is_desc:
+            ranks = {key: -rank for rank, key in enumerate(sorted(set(column)))}
+            column = [ranks[key] for key in column]
+        return column
+
+    # Sorts in a single pass by the composite sort key.
     def order_by(self, *field_names):
         c = self._clone()
-        for fieldname in reversed(field_names):
-            canon_name = fieldname.lstrip('-')
-            is_desc = fieldname.startswith('-')
-            if '__' in canon_name:
-                c.list.sort(key=lambda row: RichComparator(self._get_row_attr(row, canon_name, is_desc)), reverse=is_desc)
-            else:
-                c.list.sort(key=attrgetter(canon_name), reverse=is_desc)
+        if len(field_names) == 0:
+            return c
+        canon_names = [fieldname.lstrip('-') for fieldname in field_names]
+        directions = set(fieldname.startswith('-') for fieldname in field_names)
+        if len(directions) == 1 and all('__' not in canon_name for canon_name in canon_names):
+            # Native values of local fields are usually comparable, so try the faster sort first.
+            try:
+                c.list.sort(key=attrgetter(*canon_names), reverse=directions.pop())
+                return c
+            except TypeError:
+                c.list = copy(self.list)
+        columns = [c._get_sort_column(fieldname) for fieldname in field_names]
+        sort_keys = columns[0] if len(columns) == 1 else list(zip(*columns))
+        c.list = [c.list[i] for i in sorted(range(len(c.list)), key=sort_keys.__getitem__)]
         return c
 
     def distinct(self, *field_names):
@@ -637,7 +969,8 @@ class ListQuerySet(ValuesQuerySetMixin):
         }
     }
 
-    def aggregate(self, *args, **kwargs):
+    # Yields validated (alias, aggregate class, field name) tuples of .aggregate() arguments.
+    def _get_aggregates(self, *args, **kwargs):
         for arg in args:
             # The default_alias property raises TypeError if default_alias
             # can't be set automatically or AttributeError if it isn't an
@@ -654,22 +987,28 @@ class ListQuerySet(ValuesQuerySetMixin):
                     "Invalid aggregate '%s' '%s'"
                     % (alias, aggregate_expr)
                 )
-            expressions = aggregate_expr.get_source_expressions()
+            # Django 4.2+ appends None filter / order_by placeholders to the source expressions.
+            expressions = [expr for expr in aggregate_expr.get_source_expressions() if expr is not None]
             if len(expressions) != 1:
                 raise FieldError(
                     "Unsupported aggregate expression '%s' '%s'"
                     % (alias, aggregate_expr)
                 )
-            expression_name = expressions[0].name
-            if aggregate_expr.__class__ in self._aggregate_kwargs:
-                return self._aggregate_fn(
-                    alias, expression_name, **self._aggregate_kwargs[aggregate_expr.__class__]
-                )
-            else:
+            if aggregate_expr.__class__ not in self._aggregate_kwargs:
                 raise FieldError(
                     "Unimplemented aggregate '%s' '%s'"
                     % (alias, aggregate_expr)
                 )
+            yield alias, aggregate_expr.__class__, expressions[0].name
+
+    def _aggregate(self, alias, aggregate_cls, field_name):
+        return self._aggregate_fn(alias, field_name, **self._aggregate_kwargs[aggregate_cls])
+
+    def aggregate(self, *args, **kwargs):
+        result = {}
+        for alias, aggregate_cls, field_name in self._get_aggregates(*args, **kwargs):
+            result.update(self._aggregate(alias, aggregate_cls, field_name))
+        return result
 
     def exists(self):
         return len(self.list) > 0
@@ -721,6 +1060,7 @@ class ListQuerySet(ValuesQuerySetMixin):
         """
         c = self._clone()
         c.list = c.list.__add__(other.list)
+        c.reset_indexes()
         return c
 
     def __getitem__(self, k):
@@ -771,6 +1111,556 @@ class ListQuerySet(ValuesQuerySetMixin):
         yield from self._values_list(values_fields, flat=flat)
 
 
+# Column-oriented ListQuerySet for large in-memory datasets, for example cached report data.
+# Field values are stored as NumPy arrays when NumPy is installed (array.array / lists otherwise).
+# .filter() / .exclude() evaluate boolean masks per column, .order_by() sorts row positions, while the rows are
+# materialized only on iteration. Clones share the columns, having their own selection of row positions.
+class ColumnarListQuerySet(ListQuerySet):
+
+    # Set to False to use array.array / lists even when NumPy is installed.
+    use_numpy = True
+    # Lookups which are evaluated as NumPy vectorized operations for the numeric columns.
+    _numpy_lookups = {
+        'exact': operator.eq,
+        'gt': operator.gt,
+        'gte': operator.ge,
+        'lt': operator.lt,
+        'lte': operator.le,
+    }
+
+    def __init__(self, columns, model=None, positions=None):
+        self.model = model
+        self.columns = {}
+        super().__init__([])
+        self.columns = columns
+        self.positions = positions
+        self.size = len(next(iter(columns.values()))) if len(columns) > 0 else 0
+
+    # Columns are filtered by the masks, thus hash indexes of ListQuerySet are not used.
+    # Index state is set up without the materialization of rows.
+    def reset_indexes(self):
+        self.indexes = {}
+        self.index_lookups = {}
+        self.indexed_list = None
+
+    def create_index(self, *fieldnames):
+        return self
+
+    # NumPy module or None, when not used.
+    @property
+    def numpy(self):
+        return np if self.use_numpy else None
+
+    def to_column(self, values):
+        values = list(values)
+        value_types = set(type(val) for val in values)
+        if self.numpy is not None:
+            dtype = {
+                frozenset({bool}): self.numpy.bool_,
+                frozenset({int}): self.numpy.int64,
+                frozenset({float}): self.numpy.float64,
+            }.get(frozenset(value_types), object)
+            if dtype is not object:
+                try:
+                    return self.numpy.array(values, dtype=dtype)
+                except OverflowError:
+                    pass
+            # Fill object array elementwise, otherwise NumPy converts the sequences to the nested dimensions.
+            column = self.numpy.empty(len(values), dtype=object)
+            column[:] = values
+            return column
+        else:
+            typecode = {frozenset({int}): 'q', frozenset({float}): 'd'}.get(frozenset(value_types))
+            if typecode is not None:
+                try:
+                    return array(typecode, values)
+                except OverflowError:
+                    pass
+            return values
+
+    # Replaces the columns with the values of rows. Keeps the current column names, when not specified.
+    def _set_rows(self, rows, fields=None):
+        rows = list(rows)
+        if fields is None:
+            if len(rows) == 0:
+                fields = list(self.columns)
+            elif isinstance(rows[0], Mapping):
+                fields = list(rows[0].keys())
+            else:
+                fields = [field.attname for field in rows[0]._meta.concrete_fields]
+        if self.model is None and len(rows) > 0 and isinstance(rows[0], models.Model):
+            self.model = rows[0]._meta.model
+        get_field_val = operator.getitem if len(rows) > 0 and isinstance(rows[0], Mapping) else getattr
+        self.columns = {
+            fieldname: self.to_column(get_field_val(row, fieldname) for row in rows) for fieldname in fields
+        }
+        self.positions = None
+        self.size = len(rows)
+
+    # rows are model instances / objects or dicts, for example the result of QuerySet.values().
+    # model defaults to the class of model instance rows.
+    @classmethod
+    def from_rows(cls, rows, fields=None, model=None):
+        c = cls({}, model=model)
+        c._set_rows(rows, fields)
+        return c
+
+    @classmethod
+    def from_queryset(cls, qs, *fields):
+        if len(fields) == 0:
+            fields = [field.attname for field in qs.model._meta.concrete_fields]
+        c = cls({}, model=qs.model)
+        rows = list(qs.values_list(*fields))
+        c.columns = {
+            fieldname: c.to_column(row[key] for row in rows) for key, fieldname in enumerate(fields)
+        }
+        c.size = len(rows)
+        return c
+
+    def _clone(self, positions=None):
+        return self.__class__(
+            self.columns, model=self.model, positions=self.positions if positions is None else positions
+        )
+
+    def _get_model(self):
+        return self.model
+
+    def _get_positions(self):
+        if self.positions is not None:
+            return self.positions
+        elif self.numpy is not None:
+            return self.numpy.arange(self.size)
+        else:
+            return range(self.size)
+
+    # Resolves 'pk' and foreign key field names of .model to the column names.
+    def _resolve_column_name(self, fieldname):
+        if fieldname in self.columns or self.model is None:
+            return fieldname
+        try:
+            field = self.model._meta.pk if fieldname == 'pk' else self.model._meta.get_field(fieldname)
+            return getattr(field, 'attname', fieldname)
+        except FieldDoesNotExist:
+            return fieldname
+
+    # Columns of .model primary key / foreign keys, which are compared to the pk of Model instance query values.
+    def _get_key_column_names(self):
+        if self.model is None:
+            return set()
+        return set(
+            field.attname for field in self.model._meta.concrete_fields if field.primary_key or field.is_relation
+        )
+
+    def _prepare_column_query_val(self, fieldname, lookup, query_val):
+        if fieldname in self._get_key_column_names():
+            if isinstance(query_val, models.Model):
+                query_val = query_val.pk
+            elif lookup == 'in':
+                query_val = [val.pk if isinstance(val, models.Model) else val for val in query_val]
+        return self._prepare_query_val(lookup, query_val)
+
+    def _get_column_name(self, fieldname):
+        fieldname = self._resolve_column_name(fieldname)
+        if fieldname not in self.columns:
+            raise FieldError(
+                f"Cannot resolve keyword '{fieldname}' into column. Choices are: {', '.join(self.columns)}"
+            )
+        return fieldname
+
+    # Values of the column for the current selection of rows: NumPy array or list / array.array.
+    def _get_column_values(self, fieldname):
+        column = self.columns[self._get_column_name(fieldname)]
+        if self.positions is None:
+            return column
+        elif self.numpy is not None:
+            return column[self.positions]
+        else:
+            return [column[position] for position in self.positions]
+
+    # Values of the column for the current selection of rows as list of Python objects.
+    def _get_list_values(self, fieldname):
+        values = self._get_column_values(fieldname)
+        return values.tolist() if self.numpy is not None else list(values)
+
+    def _is_numeric(self, values):
+        return self.numpy is not None and values.dtype != object
+
+    # Numeric columns (NumPy numeric arrays or array.array) do not contain None values.
+    def _is_numeric_column(self, fieldname):
+        column = self.columns[self._get_column_name(fieldname)]
+        return isinstance(column, array) or (self.numpy is not None and column.dtype != object)
+
+    # Splits lookup key into the column name, the list of transforms and the lookup name.
+    # Column names may contain '__' separator, for example 'category__name' column of QuerySet.values().
+    def _parse_lookup_key(self, key, model=None):
+        tokens = key.split('__') if isinstance(key, str) else list(key)
+        for length in range(len(tokens), 0, -1):
+            fieldname = '__'.join(tokens[:length])
+            if self._resolve_column_name(fieldname) in self.columns:
+                break
+        lookup_tokens = tokens[length:]
+        lookup = 'exact'
+        if len(lookup_tokens) > 0 and callable(getattr(self, f'_match_{lookup_tokens[-1]}', None)):
+            lookup = lookup_tokens.pop()
+        for transform in lookup_tokens:
+            if not callable(getattr(self, f'_transform_{transform}', None)):
+                raise FieldError(f"Unsupported lookup '{transform}' of '{key}'")
+        return self._get_column_name(fieldname), lookup_tokens, lookup
+
+    def _get_mask(self, values):
+        if self.numpy is not None:
+            return self.numpy.fromiter(values, dtype=bool, count=len(self))
+        else:
+            return list(values)
+
+    def _compile_lookup_mask(self, key, query_val):
+        fieldname, transforms, lookup = self._parse_lookup_key(key)
+        query_val = self._prepare_column_query_val(fieldname, lookup, query_val)
+        values = self._get_column_values(fieldname)
+        if self._is_numeric(values) and len(transforms) == 0:
+            # NumPy numeric columns do not contain None values.
+            if lookup in self._numpy_lookups:
+                return self._numpy_lookups[lookup](values, query_val)
+            elif lookup == 'range':
+                return (values >= query_val[0]) & (values <= query_val[1])
+            elif lookup == 'in':
+                return self.numpy.isin(values, list(query_val))
+            elif lookup == 'isnull':
+                return self.numpy.full(len(values), not query_val, dtype=bool)
+        elif self.numpy is not None and len(transforms) == 0 and lookup == 'exact' and \
+                isinstance(query_val, (str, numbers.Number, date)):
+            # Elementwise comparison of object array is performed without Python loop.
+            return values == query_val
+        transform_fns = [getattr(self, f'_transform_{transform}') for transform in transforms]
+        match_method = getattr(self, f'_match_{lookup}')
+        matches_null = lookup in self._null_lookups
+
+        def match(field_val):
+            for transform_fn in transform_fns:
+                field_val = transform_fn(field_val)
+            if field_val is None and not matches_null:
+                return False
+            return match_method(field_val, query_val)
+
+        return self._get_mask(match(field_val) for field_val in self._get_list_values(fieldname))
+
+    def _compile_q_mask(self, q):
+        masks = [
+            self._compile_q_mask(child) if isinstance(child, Q) else self._compile_lookup_mask(*child)
+            for child in q.children
+        ]
+        if len(masks) == 0:
+            mask = self._get_mask(True for position in range(len(self)))
+        elif len(masks) == 1:
+            mask = masks[0]
+        elif self.numpy is not None:
+            reduce_fn = {
+                Q.OR: self.numpy.logical_or, getattr(Q, 'XOR', None): self.numpy.logical_xor
+            }.get(q.connector, self.numpy.logical_and)
+            mask = reduce_fn.reduce(masks)
+        elif q.connector == Q.OR:
+            mask = [any(row_matches) for row_matches in zip(*masks)]
+        elif q.connector == getattr(Q, 'XOR', None):
+            mask = [sum(row_matches) % 2 == 1 for row_matches in zip(*masks)]
+        else:
+            mask = [all(row_matches) for row_matches in zip(*masks)]
+        if q.negated:
+            return ~mask if self.numpy is not None else [not row_matches for row_matches in mask]
+        else:
+            return mask
+
+    def _filter(self, positive, *args, **kwargs):
+        if len(args) == 0 and len(kwargs) == 0:
+            return self._clone()
+        mask = self._compile_q_mask(Q(*args, **kwargs))
+        positions = self._get_positions()
+        if self.numpy is not None:
+            return self._clone(positions[mask if positive else ~mask])
+        else:
+            return self._clone([position for position, matches in zip(positions, mask) if bool(matches) is positive])
+
+    # Sort keys of the column: native values of numeric columns, otherwise the ranks of get_sort_key() keys.
+    # Descending keys are negated.
+    def _get_sort_column(self, fieldname):
+        canon_name = fieldname.lstrip('-')
+        is_desc = fieldname.startswith('-')
+        values = self._get_column_values(canon_name)
+        if self._is_numeric(values):
+            column = values.astype(self.numpy.int64) if values.dtype == self.numpy.bool_ else values
+        elif self._is_numeric_column(canon_name):
+            column = values
+        else:
+            sort_keys = [get_sort_key(val) for val in values]
+            ranks = {key: rank for rank, key in enumerate(sorted(set(sort_keys)))}
+            column = [ranks[key] for key in sort_keys]
+            if self.numpy is not None:
+                column = self.numpy.array(column, dtype=self.numpy.int64)
+        if is_desc:
+            return -column if self.numpy is not None else [-rank for rank in column]
+        else:
+            return column
+
+    def order_by(self, *field_names):
+        if len(field_names) == 0:
+            return self._clone()
+        columns = [self._get_sort_column(fieldname) for fieldname in field_names]
+        positions = self._get_positions()
+        if self.numpy is not None:
+            # The last key of np.lexsort() is the primary one.
+            return self._clone(positions[self.numpy.lexsort(columns[::-1])])
+        else:
+            sort_keys = columns[0] if len(columns) == 1 else list(zip(*columns))
+            return self._clone([positions[i] for i in sorted(range(len(positions)), key=sort_keys.__getitem__)])
+
+    def distinct(self, *field_names):
+        if len(field_names) == 0:
+            field_names = list(self.columns)
+        positions = self._get_positions()
+        if len(field_names) == 1 and self._is_numeric(self._get_column_values(field_names[0])):
+            _unique, first_indexes = self.numpy.unique(self._get_column_values(field_names[0]), return_index=True)
+            first_indexes.sort()
+            return self._clone(positions[first_indexes])
+        hashes = set()
+        first_indexes = []
+        for i, hsh in enumerate(zip(*[self._get_list_values(fieldname) for fieldname in field_names])):
+            if hsh not in hashes:
+                hashes.add(hsh)
+                first_indexes.append(i)
+        if self.numpy is not None:
+            return self._clone(positions[self.numpy.array(first_indexes, dtype=self.numpy.int64)])
+        else:
+            return self._clone([positions[i] for i in first_indexes])
+
+    def _aggregate(self, alias, aggregate_cls, field_name):
+        values = self._get_column_values(field_name)
+        if self._is_numeric(values) and aggregate_cls is not Count:
+            numpy_fn = {Min: self.numpy.min, Max: self.numpy.max, Sum: self.numpy.sum}[aggregate_cls]
+            return {
+                alias: None if len(values) == 0 else numpy_fn(values).item()
+            }
+        values = [val for val in self._get_list_values(field_name) if val is not None]
+        if aggregate_cls is Count:
+            result = len(values)
+        elif len(values) == 0:
+            result = None
+        else:
+            result = {Min: min, Max: max, Sum: lambda values: reduce(operator.add, values)}[aggregate_cls](values)
+        return {
+            alias: result
+        }
+
+    def _get_row_attnames(self, fieldnames):
+        attnames = []
+        for fieldname in fieldnames:
+            try:
+                attnames.append(self.model._meta.get_field(fieldname).attname)
+            except (AttributeError, FieldDoesNotExist):
+                attnames.append(fieldname)
+        return attnames
+
+    # Rows are instances of .model, when specified, otherwise SimpleNamespace.
+    def _iter_rows(self, positions=None):
+        c = self if positions is None else self._clone(positions)
+        fieldnames = list(c.columns)
+        value_lists = [c._get_list_values(fieldname) for fieldname in fieldnames]
+        if c.model is None:
+            for row in zip(*value_lists):
+                yield types.SimpleNamespace(**dict(zip(fieldnames, row)))
+        else:
+            attnames = c._get_row_attnames(fieldnames)
+            for row in zip(*value_lists):
+                obj = c.model()
+                for attname, val in zip(attnames, row):
+                    setattr(obj, attname, val)
+                yield obj
+
+    @property
+    def list(self):
+        return list(self._iter_rows())
+
+    @list.setter
+    def list(self, rows):
+        self._set_rows(rows)
+
+    # Drops the selected rows from the columns of this instance. The clones keep their own columns.
+    def delete(self):
+        if self.model is not None and not self.model._meta.auto_created:
+            rows = self.list
+            for obj in rows:
+                signals.pre_delete.send(
+                    sender=self.model, instance=obj, using=None
+                )
+            for obj in rows:
+                signals.post_delete.send(
+                    sender=self.model, instance=obj, using=None
+                )
+        self.list = []
+
+    def count(self):
+        return len(self)
+
+    def exists(self):
+        return len(self) > 0
+
+    def first(self):
+        return None if len(self) == 0 else self[0]
+
+    def last(self):
+        return None if len(self) == 0 else self[len(self) - 1]
+
+    def get(self, *args, **kwargs):
+        clone = self.filter(*args, **kwargs)
+        num = len(clone)
+        if num == 1:
+            return clone[0]
+        if num == 0:
+            raise ObjectDoesNotExist(
+                "ColumnarListQuerySet.get(%s, %s) matching query does not exist." % (
+                    args, kwargs
+                )
+            )
+        raise MultipleObjectsReturned(
+            'get() returned more than one %s -- it returned %s!' % (
+                'row' if self.model is None else self.model._meta.object_name,
+                num,
+            )
+        )
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {len(self)} rows: {", ".join(self.columns)}>'
+
+    def __iter__(self):
+        return self._iter_rows()
+
+    def __len__(self):
+        return self.size if self.positions is None else len(self.positions)
+
+    def __add__(self, other):
+        fieldnames = list(self.columns)
+        c = self.__class__({}, model=self.model)
+        c.columns = {
+            fieldname: c.to_column(self._get_list_values(fieldname) + other._get_list_values(fieldname))
+            for fieldname in fieldnames
+        }
+        c.size = len(self) + len(other)
+        return c
+
+    def __getitem__(self, k):
+        if not isinstance(k, (slice, int)):
+            raise TypeError
+        if (isinstance(k, int) and k < 0) or (
+            isinstance(k, slice) and ((k.start is not None and k.start < 0) or (k.stop is not None and k.stop < 0))
+        ):
+            raise ValueError("Negative indexing is not supported.")
+        positions = self._get_positions()
+        if isinstance(k, slice):
+            return self._clone(positions[k])
+        if k >= len(positions):
+            raise IndexError('ColumnarListQuerySet index out of range')
+        return next(self._iter_rows(positions[k:k + 1]))
+
+    def values(self, *fields):
+        fieldnames = fields if len(fields) > 0 else list(self.columns)
+        value_lists = [self._get_list_values(fieldname) for fieldname in fieldnames]
+        for row in zip(*value_lists):
+            yield dict(zip(fieldnames, row))
+
+    def values_list(self, *fields, **kwargs):
+        flat = kwargs.pop('flat', False)
+        if kwargs:
+            raise TypeError(f'Unexpected keyword arguments to values_list: {list(kwargs)}')
+        if flat and len(fields) > 1:
+            raise TypeError("'flat' is not valid when values_list is called with more than one field.")
+        fieldnames = fields if len(fields) > 0 else list(self.columns)
+        if flat:
+            yield from self._get_list_values(fieldnames[0])
+        else:
+            yield from (list(row) for row in zip(*[self._get_list_values(fieldname) for fieldname in fieldnames]))
+
+
+# Returns True when the compiled queryset joins reverse ForeignKey / ManyToManyField relations, thus it's rows may be
+# duplicated without .distinct(). Joins of .order_by() are set up only at compile time, so the clone is compiled,
+# unless compile=False is specified to check only the joins of .filter() / .exclude() calls.
+def has_multivalued_joins(queryset, compile=True):
+    query = queryset.query
+    if compile:
+        query = query.chain()
+        query.get_compiler(queryset.db).pre_sql_setup()
+    for join in query.alias_map.values():
+        join_field = getattr(join, 'join_field', None)
+        if join_field is not None and (join_field.one_to_many or join_field.many_to_many):
+            return True
+    return False
+
+
+# Pluggable strategies of queryset total rows count, used by BaseFilterView.count_queryset().
+# .is_approximate is set after the each .count() call.
+class QuerySetCounter:
+
+    is_approximate = False
+
+    def count(self, qs):
+        self.is_approximate = False
+        return qs.count()
+
+
+# Caches exact count keyed by the SQL query with it's parameters (thus by the current filter / search / route kwargs)
+# and by the data version of queryset model, which is changed via post_save / post_delete signals.
+class CachedQuerySetCounter(QuerySetCounter):
+
+    cache_alias = DEFAULT_CACHE_ALIAS
+    timeout = 300
+
+    def get_cache_key(self, qs):
+        sql, params = qs.query.sql_with_params()
+        key_hash = hashlib.sha1(json.dumps(
+            [qs.db, sql, [str(param) for param in params]]
+        ).encode('utf-8')).hexdigest()
+        model_version = get_model_version(qs.model)
+        return f'djk_count:{qs.model._meta.label_lower}:{model_version}:{key_hash}'
+
+    def count(self, qs):
+        self.is_approximate = False
+        try:
+            cache_key = self.get_cache_key(qs)
+        except EmptyResultSet:
+            return 0
+        cache = caches[self.cache_alias]
+        total = cache.get(cache_key)
+        if total is None:
+            total = qs.count()
+            cache.set(cache_key, total, self.timeout)
+        return total
+
+
+# Counts exactly up to .threshold rows, uses query planner estimate for the larger querysets.
+# Falls back to exact count for the database backends without supported estimate.
+class EstimatedQuerySetCounter(QuerySetCounter):
+
+    threshold = 10000
+
+    def estimate_postgresql(self, qs):
+        plan = json.loads(qs.explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def estimate(self, qs):
+        estimate_method = getattr(self, f'estimate_{connections[qs.db].vendor}', None)
+        return estimate_method(qs) if callable(estimate_method) else None
+
+    def count(self, qs):
+        self.is_approximate = False
+        unordered_qs = qs.order_by()
+        limited_count = unordered_qs[:self.threshold + 1].count()
+        if limited_count <= self.threshold:
+            return limited_count
+        total = self.estimate(unordered_qs)
+        if total is None:
+            return unordered_qs.count()
+        self.is_approximate = True
+        # Planner statistics may be outdated.
+        return max(total, limited_count)
+
+
 # https://docs.djangoproject.com/en/dev/topics/db/managers/#creating-a-manager-with-queryset-methods
 # To make custom QuerySet methods be available in custom Manager:
 # class MyQuerySet(FutureQuerySet):
@@ -0,0 +1,178 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models import signals
+
+from .models import get_related_field_val
+from .utils.sdv import yield_ordered
+
+
+# Pluggable strategies of BaseFilterView.search_queryset().
+# .search() may annotate the queryset with relevance .rank_alias and order it by rank, which is overridden by the
+# explicit sort order of the view.
+class IcontainsSearch:
+
+    rank_alias = 'search_rank'
+
+    def get_fieldnames(self, search_fields):
+        return [field for field, operation in yield_ordered(search_fields)]
+
+    def tokenize(self, search_str):
+        return re.findall(r'\w+', search_str)
+
+    def search(self, queryset, search_fields, search_str):
+        q = None
+        for field, operation in yield_ordered(search_fields):
+            if operation != '':
+                field += '__' + operation
+            q_kwargs = {
+                field: search_str
+            }
+            if q is None:
+                q = Q(**q_kwargs)
+            else:
+                q |= Q(**q_kwargs)
+        return queryset.filter(q)
+
+    def is_supported(self, queryset, vendor):
+        return isinstance(queryset, models.QuerySet) and connections[queryset.db].vendor == vendor
+
+
+# PostgreSQL full-text search of search_fields or of the stored (indexed) SearchVectorField .vector_field.
+# Falls back to icontains lookups for other database backends.
+class PostgresSearch(IcontainsSearch):
+
+    # Text search configuration, for example 'english'.
+    config = None
+    vector_field = None
+    search_type = 'websearch'
+
+    def search(self, queryset, search_fields, search_str):
+        if not self.is_supported(queryset, 'postgresql') or len(self.tokenize(search_str)) == 0:
+            return super().search(queryset, search_fields, search_str)
+        from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+        vector_field = self.vector_field
+        if vector_field is None:
+            vector_field = f'{self.rank_alias}_vector'
+            queryset = queryset.annotate(**{
+                vector_field: SearchVector(*self.get_fieldnames(search_fields), config=self.config)
+            })
+        query = SearchQuery(search_str, config=self.config, search_type=self.search_type)
+        return queryset.filter(**{vector_field: query}).annotate(**{
+            self.rank_alias: SearchRank(F(vector_field), query)
+        }).order_by(f'-{self.rank_alias}')
+
+
+# SQLite FTS5 virtual table of model text fields, including the related ones like 'category__name'.
+# The rowid of the table is the primary key of model instance, thus integer primary key is required.
+# Call .track() in AppConfig.ready() to maintain the index via post_save / post_delete signals and .rebuild() to
+# index the existing rows. Changes of the related models are not tracked.
+class SqliteFtsIndex:
+
+    tokenizer = 'unicode61 remove_diacritics 2'
+
+    def __init__(self, model, fieldnames, using=DEFAULT_DB_ALIAS):
+        self.model = model
+        self.fieldnames = list(fieldnames)
+        self.using = using
+
+    def get_table_name(self):
+        return f'{self.model._meta.db_table}_fts'
+
+    def quote_name(self, name):
+        return connections[self.using].ops.quote_name(name)
+
+    def create(self):
+        columns = ', '.join(self.quote_name(fieldname) for fieldname in self.fieldnames)
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.quote_name(self.get_table_name())} '
+                f"USING fts5({columns}, tokenize='{self.tokenizer}')"
+            )
+
+    def get_values(self, obj):
+        values = []
+        for fieldname in self.fieldnames:
+            val = get_related_field_val(obj, fieldname, strict_related=False)
+            values.append('' if val is None else str(val))
+        return values
+
+    def get_insert_sql(self):
+        columns = ', '.join(['rowid'] + [self.quote_name(fieldname) for fieldname in self.fieldnames])
+        placeholders = ', '.join(['%s'] * (len(self.fieldnames) + 1))
+        return f'INSERT INTO {self.quote_name(self.get_table_name())} ({columns}) VALUES ({placeholders})'
+
+    def update(self, obj):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.quote_name(self.get_table_name())} WHERE rowid = %s', [obj.pk])
+            cursor.execute(self.get_insert_sql(), [obj.pk] + self.get_values(obj))
+
+    def delete(self, pk):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.quote_name(self.get_table_name())} WHERE rowid = %s', [pk])
+
+    def rebuild(self, queryset=None, batch_size=1000):
+        if queryset is None:
+            queryset = self.model._default_manager.using(self.using).all()
+        self.create()
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.quote_name(self.get_table_name())}')
+            batch = []
+            for obj in queryset.iterator(chunk_size=batch_size):
+                batch.append([obj.pk] + self.get_values(obj))
+                if len(batch) >= batch_size:
+                    cursor.executemany(self.get_insert_sql(), batch)
+                    batch = []
+            if len(batch) > 0:
+                cursor.executemany(self.get_insert_sql(), batch)
+
+    def post_save(self, sender, instance, using, **kwargs):
+        if using == self.using:
+            self.update(instance)
+
+    def post_delete(self, sender, instance, using, **kwargs):
+        if using == self.using:
+            self.delete(instance.pk)
+
+    def track(self):
+        self.create()
+        dispatch_uid = f'djk_fts:{self.using}:{self.model._meta.label_lower}'
+        signals.post_save.connect(self.post_save, sender=self.model, weak=False, dispatch_uid=f'{dispatch_uid}:save')
+        signals.post_delete.connect(
+            self.post_delete, sender=self.model, weak=False, dispatch_uid=f'{dispatch_uid}:delete'
+        )
+
+    # Each word is matched as a prefix, all of the words should match.
+    def get_match(self, words):
+        return ' '.join(f'"{word}"*' for word in words)
+
+
+# SQLite FTS5 search ranked by bm25(). Index of search_fields should be maintained via SqliteFtsIndex.
+# Falls back to icontains lookups for other database backends.
+class SqliteFtsSearch(IcontainsSearch):
+
+    index_class = SqliteFtsIndex
+
+    def ioc_index(self, queryset, search_fields):
+        return self.index_class(queryset.model, self.get_fieldnames(search_fields), using=queryset.db)
+
+    def search(self, queryset, search_fields, search_str):
+        words = self.tokenize(search_str)
+        if not self.is_supported(queryset, 'sqlite') or len(words) == 0:
+            return super().search(queryset, search_fields, search_str)
+        index = self.ioc_index(queryset, search_fields)
+        match = index.get_match(words)
+        fts_table = index.quote_name(index.get_table_name())
+        opts = queryset.model._meta
+        pk_column = f'{index.quote_name(opts.db_table)}.{index.quote_name(opts.pk.column)}'
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH %s', (match,))
+        ).annotate(**{
+            # Lower bm25() value means better match.
+            self.rank_alias: RawSQL(
+                f'SELECT bm25({fts_table}) FROM {fts_table} WHERE {fts_table} MATCH %s AND rowid = {pk_column}',
+                (match,)
+            )
+        }).order_by(self.rank_alias)
@@ -8,6 +8,57 @@ import { showAjaxError } from './errors.js';
 import { Url } from './url.js';
 import { vmRouter } from './ioc.js';
 
+// Requests queued by Actions.batchAjax() during the current tick.
+var batchQueue = [];
+
+/**
+ * Sends queued requests to server-side ActionsBatchView, AppConf('actionsBatchRoute').
+ */
+function sendBatch() {
+    var queue = batchQueue;
+    batchQueue = [];
+    if (queue.length === 1) {
+        var item = queue[0];
+        item.actions.sendAjax(item.action, item.queryArgs, item.callback)
+        .done(item.deferred.resolve)
+        .fail(item.deferred.reject);
+        return;
+    }
+    var batch = [];
+    each(queue, function(item) {
+        batch.push(item.actions.getBatchEntry(item.action, item.queryArgs));
+    });
+    $.ajax({
+        url: Url(AppConf('actionsBatchRoute')),
+        type: 'POST',
+        data: {
+            csrfmiddlewaretoken: queue[0].actions.getCsrfToken(),
+            batch: JSON.stringify(batch),
+        },
+        dataType: 'json',
+        success: function(response, textStatus) {
+            each(queue, function(item, k) {
+                var result = response[k];
+                // Subset of jqXHR interface used by Actions.getAjaxResponse().
+                var entryXHR = {
+                    status: result.status,
+                    getResponseHeader: function(name) {
+                        return propGet(result.headers, name, null);
+                    }
+                };
+                item.actions.ajaxSuccess(item.action, result.response, entryXHR, item.callback);
+                item.deferred.resolve(result.response, textStatus, entryXHR);
+            });
+        },
+    })
+    .fail(function(jqXHR, textStatus, errorThrown) {
+        showAjaxError(jqXHR, textStatus);
+        each(queue, function(item) {
+            item.deferred.reject(jqXHR, textStatus, errorThrown);
+        });
+    });
+}
+
 /**
  * Client-side AJAX request / response viewmodel handler for server-side ActionsView.
  */
@@ -108,27 +159,96 @@ function Actions(options) {
      * in such case callback: {context: bindContext} is enough.
      */
     Actions.ajax = function(action, queryArgs, callback) {
-        var self = this;
         if (typeof queryArgs === 'undefined') {
             queryArgs = {};
         }
+        if (this.canBatch(action)) {
+            return this.batchAjax(action, queryArgs, callback);
+        } else {
+            return this.sendAjax(action, queryArgs, callback);
+        }
+    };
+
+    Actions.sendAjax = function(action, queryArgs, callback) {
+        var self = this;
         queryArgs.csrfmiddlewaretoken = this.getCsrfToken();
-        return $.post(this.getUrl(action),
-            queryArgs,
-            function(response) {
-                self.respond(action, response, callback);
-                if (callback !== undefined) {
-                    var vm = self.getOurViewmodel(response);
-                    if (vm !== null) {
-                        vmRouter.applyHandler(vm, callback);
-                    }
-                }
+        return $.ajax({
+            url: this.getUrl(action),
+            type: 'POST',
+            data: queryArgs,
+            headers: this.getAjaxHeaders(action),
+            dataType: 'json',
+            success: function(response, textStatus, jqXHR) {
+                self.ajaxSuccess(action, response, jqXHR, callback);
             },
-            'json'
-        )
+        })
         .fail(showAjaxError);
     };
 
+    Actions.ajaxSuccess = function(action, response, jqXHR, callback) {
+        response = this.getAjaxResponse(action, response, jqXHR);
+        this.respond(action, response, callback);
+        if (callback !== undefined) {
+            var vm = this.getOurViewmodel(response);
+            if (vm !== null) {
+                vmRouter.applyHandler(vm, callback);
+            }
+        }
+    };
+
+    /**
+     * Actions with extra HTTP request headers (conditional requests) are not batched,
+     * because batch request headers are common for all of the actions.
+     */
+    Actions.canBatch = function(action) {
+        return AppConf('actionsBatchRoute', null) !== null && $.isEmptyObject(this.getAjaxHeaders(action));
+    };
+
+    /**
+     * Queues the action, so the actions performed during the current tick are sent as one batch request.
+     */
+    Actions.batchAjax = function(action, queryArgs, callback) {
+        var deferred = $.Deferred();
+        if (batchQueue.length === 0) {
+            setTimeout(sendBatch, 0);
+        }
+        batchQueue.push({
+            actions: this,
+            action: action,
+            queryArgs: queryArgs,
+            callback: callback,
+            deferred: deferred
+        });
+        return deferred.promise();
+    };
+
+    /**
+     * Server-side ActionsBatchView entry of the action.
+     */
+    Actions.getBatchEntry = function(action, queryArgs) {
+        return {
+            route: this.route,
+            route_kwargs: this.routeKwargs,
+            action_kwarg: this.actionKwarg,
+            action: action,
+            params: $.param(queryArgs),
+        };
+    };
+
+    /**
+     * Extra HTTP request headers of the action, for example conditional request headers.
+     */
+    Actions.getAjaxHeaders = function(action) {
+        return {};
+    };
+
+    /**
+     * Override to process the response of conditional request (HTTP 304 Not Modified has no response body).
+     */
+    Actions.getAjaxResponse = function(action, response, jqXHR) {
+        return response;
+    };
+
     Actions.respond = function(action, response, options) {
         var self = this;
         if (this.ladda) {
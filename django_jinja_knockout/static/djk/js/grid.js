@@ -113,7 +113,10 @@ function Grid(options) {
     Grid.queryKeys = {
         filter: 'list_filter',
         order:  'list_order_by',
-        search: 'list_search'
+        search: 'list_search',
+        cursor: 'list_cursor',
+        version: 'list_version',
+        delta: 'list_delta'
     };
 
     Grid.localize = function() {
@@ -133,6 +136,7 @@ function Grid(options) {
             this.options.ajaxParams
         );
         this.queryFilters = {};
+        this.listCursors = {};
     };
 
     Grid.firstLoad = function(callback) {
@@ -355,6 +359,8 @@ function Grid(options) {
         this.gridRows = ko.observableArray();
         this.gridPages = ko.observableArray();
         this.gridTotalPages = ko.observable(0);
+        // Total pages count is an estimate, see BaseFilterView.queryset_counter.
+        this.gridTotalPagesApproximate = ko.observable(false);
         this.gridSearchStr = ko.observable('');
         this.gridSearchStr.subscribe(this.onGridSearchStr, this);
         this.gridSearchDisplayStr = ko.observable('');
@@ -889,13 +895,33 @@ function Grid(options) {
 
     Grid.onPagination = function(page) {
         var self = this;
+        var currPage = self.queryArgs.page;
         self.queryArgs.page = parseInt(page);
         if (isNaN(self.queryArgs.page)) {
             self.queryArgs.page = 1;
         }
+        self.setQueryCursor(currPage);
         self.listAction();
     };
 
+    /**
+     * KoGridView.keyset_pagination: request the adjacent page by seek cursor instead of LIMIT / OFFSET.
+     * The cursor is used only once, see .listCallback().
+     */
+    Grid.setQueryCursor = function(currPage) {
+        var cursor;
+        if (this.queryArgs.page === currPage + 1) {
+            cursor = propGet(this.listCursors, 'next');
+        } else if (this.queryArgs.page === currPage - 1) {
+            cursor = propGet(this.listCursors, 'prev');
+        }
+        if (cursor) {
+            this.queryArgs[this.queryKeys.cursor] = cursor;
+        } else {
+            delete this.queryArgs[this.queryKeys.cursor];
+        }
+    };
+
     Grid.selectOnlyKoRow = function(currKoRow) {
         var self = this;
         var currPkVal = currKoRow.getPkVal();
@@ -1063,16 +1089,19 @@ function Grid(options) {
 
     Grid.iocKoFilter_datetime = function(filter, options) {
         options.type = 'datetime';
+        options.stats = propGet(filter, 'stats', null);
         return {cls: GridRangeFilter, options};
     };
 
     Grid.iocKoFilter_date = function(filter, options) {
         options.type = 'date';
+        options.stats = propGet(filter, 'stats', null);
         return {cls: GridRangeFilter, options};
     };
 
     Grid.iocKoFilter_number = function(filter, options) {
         options.type = 'number';
+        options.stats = propGet(filter, 'stats', null);
         return {cls: GridRangeFilter, options};
     };
 
@@ -1112,6 +1141,32 @@ function Grid(options) {
         return result;
     };
 
+    /**
+     * Update choices filters with server-side KoGridView.facet_counts.
+     */
+    Grid.setFacetCounts = function(facetCounts) {
+        var self = this;
+        each(facetCounts, function(counts, fieldName) {
+            var koFilter = self.getKoFilter(fieldName);
+            if (koFilter !== null && typeof koFilter.setFacetCounts === 'function') {
+                koFilter.setFacetCounts(counts);
+            }
+        });
+    };
+
+    /**
+     * Update range filters with server-side KoGridView.range_stats.
+     */
+    Grid.setRangeStats = function(rangeStats) {
+        var self = this;
+        each(rangeStats, function(stats, fieldName) {
+            var koFilter = self.getKoFilter(fieldName);
+            if (koFilter !== null && typeof koFilter.setStats === 'function') {
+                koFilter.setStats(stats);
+            }
+        });
+    };
+
     /**
      * Setup filters viewmodels (grid initial loading stage).
      */
@@ -1166,7 +1221,7 @@ function Grid(options) {
     /**
      * Setup pagination viewmodel.
      */
-    Grid.setKoPagination = function(totalPages, currPage) {
+    Grid.setKoPagination = function(totalPages, currPage, isApproximate) {
         var self = this;
         /**
          * Update queryArgs.page value because current page number may be recalculated
@@ -1175,6 +1230,7 @@ function Grid(options) {
         self.queryArgs.page = currPage;
         self.gridPages([]);
         this.gridTotalPages(totalPages);
+        this.gridTotalPagesApproximate(isApproximate === true);
         var maxVisiblePages = 5;
         var hasFoldingPage = false;
         var startingPage = currPage - maxVisiblePages;
@@ -1207,7 +1263,7 @@ function Grid(options) {
             self.gridPages.push(
                 this.iocGridPage({
                     'isActive': (i === currPage),
-                    'title': i,
+                    'title': (i === totalPages && this.gridTotalPagesApproximate()) ? '~' + i : i,
                     'pageNumber':  i
                 })
             );
@@ -1288,10 +1344,40 @@ function Grid(options) {
 
     Grid.listCallback = function(data) {
         var self=this;
+        // Cursor is valid only for the current filters / search, thus it is dropped after the page was loaded.
+        delete this.queryArgs[this.queryKeys.cursor];
         if (propGet(data, 'has_errors') === true) {
             // There is nothing to list. Additional error viewmodel might be processed instead.
             return;
         }
+        if (propGet(data, 'unchanged') === true) {
+            // Server-side KoGridView.conditional_list: current rows / pagination are up to date.
+            return;
+        }
+        if (typeof data.listVersion !== 'undefined') {
+            this.queryArgs[this.queryKeys.version] = data.listVersion;
+        } else {
+            delete this.queryArgs[this.queryKeys.version];
+        }
+        if (typeof data.deltaToken !== 'undefined') {
+            this.queryArgs[this.queryKeys.delta] = data.deltaToken;
+        } else {
+            delete this.queryArgs[this.queryKeys.delta];
+        }
+        this.listCursors = propGet(data, 'cursors', {});
+        if (typeof data.facetCounts !== 'undefined') {
+            this.setFacetCounts(data.facetCounts);
+        }
+        if (typeof data.rangeStats !== 'undefined') {
+            this.setRangeStats(data.rangeStats);
+        }
+        if (propGet(data, 'delta') === true) {
+            // Server-side KoGridView.delta_update: only the rows changed since the previous list / update are sent.
+            this.updatePage(data);
+            this.hasSelectAllRows(this.checkAllRowsSelected());
+            this.setKoPagination(data.totalPages, data.page, propGet(data, 'approximateTotalPages', false));
+            return;
+        }
         // console.log(data);
         if (this.options.vScrollPage) {
             this.vScrollPage();
@@ -1339,7 +1425,7 @@ function Grid(options) {
         // Re-enable meta.rowsPerPage() subscription.
         this.subscribeToMethod('meta.rowsPerPage');
         // Set grid pagination viewmodels.
-        this.setKoPagination(data.totalPages, data.page);
+        this.setKoPagination(data.totalPages, data.page, propGet(data, 'approximateTotalPages', false));
     };
 
     Grid.iocKoAction = function(options) {
@@ -1,3 +1,4 @@
+import { each } from '../lib/underscore-esm.js';
 import { inherit } from '../dash.js';
 import { Trans } from '../translate.js';
 import { Actions } from '../actions.js';
@@ -5,6 +6,11 @@ import { renderNestedList } from '../nestedlist.js';
 import { blockTags, ui } from '../ui.js';
 import { ModelFormDialog, ActionTemplateDialog } from '../modelform.js';
 
+/**
+ * 'meta' viewmodels of the grids with server-side KoGridView.cache_meta enabled, keyed by 'meta' action url.
+ */
+var metaCache = {};
+
 /**
  * ViewModel actions performed for particular grid (row) instance.
  * Mostly are row-click AJAX actions, although not limited to.
@@ -19,6 +25,7 @@ function GridActions(options) {
 
     GridActions.actionKwarg = 'action';
     GridActions.viewModelName = 'grid_page';
+    GridActions.metaKeys = ['action_kwarg', 'sortOrders', 'meta', 'actions', 'gridFields', 'filters', 'markSafe'];
 
     GridActions.init = function(options) {
         this._super._call('init', options);
@@ -81,6 +88,73 @@ function GridActions(options) {
         this.grid.onSwitchHighlight();
     };
 
+    GridActions.isMetaAction = function(action) {
+        return action === 'meta' || action === 'meta_list';
+    };
+
+    GridActions.getAjaxHeaders = function(action) {
+        var headers = this._super._call('getAjaxHeaders', action);
+        var cachedMeta = metaCache[this.getUrl('meta')];
+        if (this.isMetaAction(action) && cachedMeta !== undefined) {
+            headers['If-None-Match'] = cachedMeta.etag;
+        }
+        return headers;
+    };
+
+    /**
+     * Restores cached 'meta' viewmodel when the server-side responded it was not modified,
+     * stores 'meta' viewmodel served with ETag otherwise.
+     */
+    GridActions.getAjaxResponse = function(action, response, jqXHR) {
+        if (!this.isMetaAction(action)) {
+            return response;
+        }
+        var metaUrl = this.getUrl('meta');
+        var cachedMeta = metaCache[metaUrl];
+        if (jqXHR.status === 304) {
+            var vm = $.extend(true, {}, cachedMeta.vm);
+            vm.view = this.viewModelName;
+            return [vm];
+        }
+        var ourVm = this.getOurViewmodel(response);
+        if (ourVm === null) {
+            return response;
+        }
+        if (ourVm.metaNotModified) {
+            delete ourVm.metaNotModified;
+            $.extend(true, ourVm, cachedMeta.vm);
+        } else {
+            var etag = jqXHR.getResponseHeader('ETag');
+            if (etag !== null) {
+                var metaVm = {};
+                each(this.metaKeys, function(key) {
+                    if (typeof ourVm[key] !== 'undefined') {
+                        metaVm[key] = ourVm[key];
+                    }
+                });
+                metaCache[metaUrl] = {etag: etag, vm: $.extend(true, {}, metaVm)};
+            }
+        }
+        return response;
+    };
+
+    GridActions.queryargs_export = function(queryArgs) {
+        return $.extend(queryArgs, this.grid.getListQueryArgs());
+    };
+
+    /**
+     * Server-side KoGridView.action_export() streams the file, thus it is downloaded via form submission
+     * instead of AJAX request.
+     */
+    GridActions.perform_export = function(queryArgs, ajaxCallback) {
+        var $form = $('<form>', {method: 'post', action: this.getUrl('export')}).hide();
+        queryArgs.csrfmiddlewaretoken = this.getCsrfToken();
+        each(queryArgs, function(value, key) {
+            $form.append($('<input>', {type: 'hidden', name: key, value: value}));
+        });
+        $form.appendTo('body').trigger('submit').remove();
+    };
+
     GridActions.callback_create_form = function(viewModel) {
         viewModel.owner = this.grid;
         var dialog = new ModelFormDialog(viewModel);
@@ -0,0 +1,117 @@
+import { inherit, mixProps } from '../dash.js';
+import { propGet } from '../prop.js';
+import { Subscriber } from '../ko.js';
+import { Actions } from '../actions.js';
+
+/**
+ * Performs server-side KoGridView 'autocomplete' action of the related grid.
+ * .owner is the instance of GridAutocomplete.
+ */
+function GridAutocompleteActions(options) {
+
+    inherit(Actions.prototype, this);
+    this.init(options);
+
+} void function(GridAutocompleteActions) {
+
+    GridAutocompleteActions.viewModelName = 'grid_page';
+
+    GridAutocompleteActions.getActions = function() {
+        return {
+            'autocomplete': {},
+        };
+    };
+
+    GridAutocompleteActions.callback_autocomplete = function(viewModel) {
+        this.owner.setEntries(viewModel);
+    };
+
+}(GridAutocompleteActions.prototype);
+
+/**
+ * Typeahead to select the related model instance without loading GridDialog.
+ * Used by FkGridFilter / FkGridWidget when fkGridOptions.autocomplete is set, for example:
+    'fkGridOptions': {
+        'category': {
+            'pageRoute': 'category_grid',
+            'autocomplete': {'searchPlaceholder': 'Category name'}
+        }
+    }
+ * .owner should implement .onAutocompleteSelect(entry) and .onAutocompleteBrowse() methods.
+ */
+function GridAutocomplete(options) {
+
+    this.init(options);
+
+} void function(GridAutocomplete) {
+
+    /**
+     * options.fkGridOptions.autocomplete: true or {searchKey, searchPlaceholder, delay}.
+     */
+    GridAutocomplete.init = function(options) {
+        mixProps(Subscriber.prototype, this);
+        this.owner = options.owner;
+        var fkGridOptions = options.fkGridOptions;
+        var autocompleteOptions = (fkGridOptions.autocomplete === true) ? {} : fkGridOptions.autocomplete;
+        this.searchKey = propGet(autocompleteOptions, 'searchKey', 'list_search');
+        this.searchPlaceholder = propGet(
+            autocompleteOptions, 'searchPlaceholder', propGet(fkGridOptions, 'searchPlaceholder', '')
+        );
+        this.actions = this.iocActions({
+            owner: this,
+            route: fkGridOptions.pageRoute,
+            routeKwargs: propGet(fkGridOptions, 'pageRouteKwargs', {}),
+        });
+        this.searchStr = ko.observable('').extend({
+            rateLimit: {timeout: propGet(autocompleteOptions, 'delay', 300), method: 'notifyWhenChangesStop'}
+        });
+        this.entries = ko.observableArray();
+        this.hasMore = ko.observable(false);
+        this.isOpen = ko.observable(false);
+        this.subscribeToMethod('searchStr');
+    };
+
+    GridAutocomplete.iocActions = function(options) {
+        return new GridAutocompleteActions(options);
+    };
+
+    GridAutocomplete.onSearchStr = function(value) {
+        if (value === '') {
+            this.entries([]);
+            this.isOpen(false);
+            return;
+        }
+        var queryArgs = {};
+        queryArgs[this.searchKey] = value;
+        this.actions.perform('autocomplete', {queryArgs: queryArgs});
+    };
+
+    GridAutocomplete.setEntries = function(viewModel) {
+        // Skip the response of outdated search string.
+        if (viewModel.search !== this.searchStr()) {
+            return;
+        }
+        this.entries(viewModel.entries);
+        this.hasMore(viewModel.hasMore);
+        this.isOpen(true);
+    };
+
+    GridAutocomplete.reset = function() {
+        this.searchStr('');
+        this.entries([]);
+        this.isOpen(false);
+    };
+
+    GridAutocomplete.onSelect = function(entry) {
+        this.reset();
+        this.owner.onAutocompleteSelect(entry);
+    };
+
+    GridAutocomplete.onBrowse = function() {
+        this.reset();
+        this.owner.onAutocompleteBrowse();
+    };
+
+}(GridAutocomplete.prototype);
+
+export { GridAutocompleteActions, GridAutocomplete };
@@ -4,6 +4,7 @@ import { Subscriber } from '../ko.js';
 import { Trans } from '../translate.js';
 
 import { FilterDialog, GridDialog } from './dialogs.js';
+import { GridAutocomplete } from './autocomplete.js';
 
 /**
  * Grid filter choice control. One dropdown filter has multiple filter choices.
@@ -38,6 +39,8 @@ function GridFilterChoice(options) {
         this.ownerFilter = options.ownerFilter;
         this.name = options.name;
         this.value = options.value;
+        // Number of rows for the choice (server-side facet counts), null when unknown.
+        this.count = ko.observable(propGet(options, 'count', null));
         this.is_active = ko.observable();
         this.is_active.subscribe(this.updateQueryFilter, this);
         this.is_active(options.is_active);
@@ -174,6 +177,7 @@ function GridFilter(options) {
                 ownerFilter: this,
                 name: choice.name,
                 value: propGet(choice, 'value'),
+                count: propGet(choice, 'count', null),
                 is_active: (typeof choice.is_active) === 'undefined' ? false : choice.is_active
             });
             if (koFilterChoice.value === undefined) {
@@ -183,6 +187,25 @@ function GridFilter(options) {
         }
     };
 
+    /**
+     * counts: list of [value, count] pairs of server-side KoGridView.vm_get_facet_counts().
+     */
+    GridFilter.setFacetCounts = function(counts) {
+        for (var i = 0; i < this.choices.length; i++) {
+            var choice = this.choices[i];
+            if (choice.value !== undefined) {
+                var count = 0;
+                for (var j = 0; j < counts.length; j++) {
+                    if (counts[j][0] === choice.value) {
+                        count = counts[j][1];
+                        break;
+                    }
+                }
+                choice.count(count);
+            }
+        }
+    };
+
     // Return the count of active filter choices except for special 'reset all choice' (choice.value === undefined).
     // Also initialized this.resetFilter.
     GridFilter.getTotalActive = function() {
@@ -327,6 +350,19 @@ function FkGridFilter(options) {
             gridDialogOptions = options.fkGridOptions.dialogOptions;
             delete options.fkGridOptions.dialogOptions;
         }
+        var autocompleteOptions = propGet(options.fkGridOptions, 'autocomplete', false);
+        if (autocompleteOptions) {
+            if (typeof options.templateName === 'undefined') {
+                options.templateName = 'ko_grid_filter_autocomplete';
+            }
+            this.autocomplete = new GridAutocomplete({
+                owner: this,
+                fkGridOptions: options.fkGridOptions
+            });
+            delete options.fkGridOptions.autocomplete;
+        } else {
+            this.autocomplete = null;
+        }
         gridDialogOptions = $.extend({
             owner: this,
             filterOptions: options.fkGridOptions
@@ -341,6 +377,17 @@ function FkGridFilter(options) {
         this.gridDialog.show();
     };
 
+    FkGridFilter.onAutocompleteSelect = function(entry) {
+        if (this.gridDialog.grid !== undefined) {
+            this.gridDialog.grid.addSelectedPkVal(entry.pk);
+        }
+        this.onGridDialogSelectRow({pkVal: entry.pk});
+    };
+
+    FkGridFilter.onAutocompleteBrowse = function() {
+        this.gridDialog.show();
+    };
+
     FkGridFilter.onGridDialogSelectRow = function(options) {
         if (!this.allowMultipleChoices) {
             this.removeQueryFilter({
@@ -425,6 +472,14 @@ function GridRangeFilter(options) {
             throw new Error('GridRangeFilter.' + method + ' is not the function');
         }
         this.fieldAttrs = this[method]();
+        // Bounds of field values {min, max, histogram}, see server-side BaseFilterView.range_stats.
+        this.stats = ko.observable(propGet(options, 'stats', null));
+        this.fromAttrs = ko.pureComputed(function() {
+            return this.getInputAttrs('min');
+        }, this);
+        this.toAttrs = ko.pureComputed(function() {
+            return this.getInputAttrs('max');
+        }, this);
         this.filterDialog = new FilterDialog({
             owner: this,
             title: this.name,
@@ -453,6 +508,19 @@ function GridRangeFilter(options) {
         };
     };
 
+    GridRangeFilter.getInputAttrs = function(bound) {
+        var stats = this.stats();
+        var attrs = Object.assign({}, this.fieldAttrs);
+        if (stats !== null && stats[bound] !== null) {
+            attrs.placeholder = stats[bound];
+        }
+        return attrs;
+    };
+
+    GridRangeFilter.setStats = function(stats) {
+        this.stats(stats);
+    };
+
     GridRangeFilter.onDropdownClick = function(ev) {
         this.filterDialog.show();
     };
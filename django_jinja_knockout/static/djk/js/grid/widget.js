@@ -5,6 +5,7 @@ import { transformTags } from '../ui.js';
 import { blockTags } from '../ui.js';
 import { renderNestedList } from '../nestedlist.js';
 import { GridDialog } from './dialogs.js';
+import { GridAutocomplete } from './autocomplete.js';
 
 /**
  * Client-side part of widgets.MultipleKeyGridWidget / ForeignKeyGridWidget
@@ -67,6 +68,15 @@ function FkGridWidget(options) {
         this.options = {
             expandRowContents: propGet(options, 'expandRowContents', 1)
         };
+        if (propGet(gridOptions, 'autocomplete', false)) {
+            this.autocomplete = new GridAutocomplete({
+                owner: this,
+                fkGridOptions: gridOptions
+            });
+            delete gridOptions.autocomplete;
+        } else {
+            this.autocomplete = null;
+        }
         this.gridDialog = new GridDialog({
             owner: this,
             filterOptions: gridOptions
@@ -120,6 +130,10 @@ function FkGridWidget(options) {
     FkGridWidget.deleteFk = function(inputRow) {
         this.inputRows.remove(inputRow);
         var fkGrid = this.gridDialog.grid;
+        if (fkGrid === undefined) {
+            // Selected via autocomplete, GridDialog was not used yet.
+            return;
+        }
         var koRow = fkGrid.findKoRowByPkVal(inputRow.pk);
         if (koRow !== null) {
             koRow.isSelectedRow(false);
@@ -176,6 +190,26 @@ function FkGridWidget(options) {
         return inputRow;
     };
 
+    /**
+     * Input row of GridAutocomplete entry, which has only pk and str() of the related model instance.
+     */
+    FkGridWidget.iocAutocompleteInputRow = function(entry) {
+        var self = this;
+        var inputRow = {
+            widget: this,
+            pk: entry.pk,
+            desc: ko.observable(entry.__str),
+            css: {},
+            onClick: function() {},
+            canDelete: true,
+        };
+        inputRow.display = ko.pureComputed(this.getInputRowDisplay, inputRow);
+        inputRow.remove = function() {
+            self.deleteFk(inputRow);
+        };
+        return inputRow;
+    };
+
     FkGridWidget.updateInputRow = function(koRow) {
         var matchingRow = this.findInputRowByPkVal(koRow.getPkVal());
         // not found matchingRow === null in Knockout 3.4, === undefined in Knockout 3.5.
@@ -188,6 +222,26 @@ function FkGridWidget(options) {
         this.gridDialog.show();
     };
 
+    FkGridWidget.onAutocompleteSelect = function(entry) {
+        if (this.gridDialog.grid !== undefined) {
+            this.gridDialog.grid.addSelectedPkVal(entry.pk);
+        }
+        var inputRow = this.iocAutocompleteInputRow(entry);
+        if (this.selectMultipleRows) {
+            // MultipleKeyGridWidget
+            if (!this.findInputRowByPkVal(entry.pk)) {
+                this.inputRows.push(inputRow);
+            }
+        } else {
+            // ForeignKeyGridWidget
+            this.inputRows([inputRow]);
+        }
+    };
+
+    FkGridWidget.onAutocompleteBrowse = function() {
+        this.gridDialog.show();
+    };
+
     FkGridWidget.onGridDialogRowsChange = function(changes) {
         console.log(changes);
         for (var i = 0; i < changes.length; i++) {
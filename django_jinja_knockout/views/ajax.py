@@ -1,28 +1,63 @@
+import csv
+import hashlib
+import json
+import logging
 from collections import OrderedDict
-from copy import deepcopy
+from copy import copy, deepcopy
 from math import ceil
 
 from django.conf import settings
+from django.core import signing
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.http import HttpResponseNotModified, StreamingHttpResponse, QueryDict
+from django.http.response import HttpResponseBase
+from django.db import models, connections
+from django.urls import reverse, resolve, NoReverseMatch, Resolver404
+from django.utils.datastructures import MultiValueDict
 from django.utils.html import format_html
-from django.utils.translation import gettext as _
+from django.utils.translation import gettext as _, get_language
 from django.forms import model_to_dict
 
+from .. import apps
 from ..validators import ViewmodelValidator
 from ..forms.vm_renderers import FormViewmodel, InlineViewmodel
 from ..utils import sdv
+from .. import http
 from .. import tpl
 from ..models import (
-    get_meta, get_verbose_name, model_fields_verbose_names, model_values, get_object_description, yield_related_models
+    get_meta, get_verbose_name, get_related_field_val, model_fields_verbose_names, model_values, get_object_description,
+    yield_related_models, is_multivalued_path, get_model_version
 )
-from ..query import ListQuerySet
+from ..query import ListQuerySet, has_multivalued_joins
 from ..viewmodels import vm_list, to_vm_list
 from .base import FormatTitleMixin, ViewmodelView, BaseFilterView, FormViewmodelsMixin
 
 
+logger = logging.getLogger(__name__)
+
+
 MIN_OBJECTS_PER_PAGE = getattr(settings, 'OBJECTS_PER_PAGE', 10)
 MAX_OBJECTS_PER_PAGE = MIN_OBJECTS_PER_PAGE * 5
 
 
+# Serializes keyset pagination cursor values (dates / decimals) with the same encoder as viewmodels.
+class CursorSerializer:
+
+    def dumps(self, obj):
+        return tpl.to_json(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        return json.loads(data.decode('utf-8'))
+
+
+# Pseudo-buffer for csv.writer() which returns the formatted line instead of storing it, to stream CSV rows.
+class EchoBuffer:
+
+    def write(self, value):
+        return value
+
+
 # ViewmodelView with actions router.
 class ActionsView(FormatTitleMixin, ViewmodelView):
 
@@ -172,7 +207,10 @@ class ActionsView(FormatTitleMixin, ViewmodelView):
         self.args = args
         self.kwargs = kwargs
         result = self.get_action_handler()()
-        if result is None:
+        if isinstance(result, HttpResponseBase):
+            # File download / streaming action.
+            return result
+        elif result is None:
             # Will process client-side Actions class "callback_{viewmodel_name}"  method.
             result = vm_list(view=self.viewmodel_name)
         elif result is False:
@@ -186,6 +224,90 @@ class ActionsView(FormatTitleMixin, ViewmodelView):
         return result
 
 
+# Performs the list of ActionsView actions in one HTTP request, to reduce the number of AJAX requests on page load.
+# Client-side Actions class coalesces the requests issued at the same time, when settings.DJK_ACTIONS_BATCH_ROUTE
+# is the url name of this view.
+class ActionsBatchView(ViewmodelView):
+
+    batch_key = 'batch'
+    max_batch_size = 20
+    # Headers of the action responses passed to the client-side Actions.getAjaxResponse().
+    response_headers = ('ETag',)
+
+    def get_batch(self):
+        try:
+            batch = json.loads(self.request.POST.get(self.batch_key, ''))
+        except ValueError:
+            batch = None
+        if not isinstance(batch, list) or not all(isinstance(entry, dict) for entry in batch):
+            self.report_error('Invalid batch request')
+        if len(batch) > self.max_batch_size:
+            self.report_error(
+                'Batch request has {} actions, maximal allowed number is {}', len(batch), self.max_batch_size
+            )
+        return batch
+
+    def get_entry_url(self, entry):
+        route_kwargs = entry.get('route_kwargs')
+        kwargs = dict(route_kwargs) if isinstance(route_kwargs, dict) else {}
+        kwargs[entry.get('action_kwarg', ActionsView.action_kwarg)] = f"/{entry.get('action', '')}"
+        return reverse(entry.get('route'), kwargs=kwargs)
+
+    # Shallow copy of the batch request with the method / path / arguments of the action request.
+    def get_entry_request(self, entry, url, match):
+        request = copy(self.request)
+        request.META = copy(self.request.META)
+        request.path = request.path_info = url
+        request.resolver_match = match
+        request.GET = QueryDict()
+        request.POST = QueryDict(entry.get('params', ''))
+        request._files = MultiValueDict()
+        return request
+
+    def get_entry_error(self, status, message):
+        return {
+            'status': status,
+            'headers': {},
+            'response': [{'view': 'alert_error', 'title': _('Error'), 'message': message}],
+        }
+
+    def perform_entry(self, entry):
+        try:
+            url = self.get_entry_url(entry)
+            match = resolve(url)
+        except (NoReverseMatch, Resolver404, TypeError):
+            return self.get_entry_error(404, format_html(_('Unknown route "{}"'), entry.get('route')))
+        view_class = getattr(match.func, 'view_class', None)
+        if view_class is None or not issubclass(view_class, ActionsView):
+            return self.get_entry_error(400, format_html(_('Route "{}" is not an ActionsView'), entry.get('route')))
+        if not isinstance(entry.get('params', ''), str):
+            # Client-side Actions sends the urlencoded string of action arguments.
+            return self.get_entry_error(
+                400, format_html(_('Action "{}" params should be urlencoded string'), entry.get('action'))
+            )
+        request = self.get_entry_request(entry, url, match)
+        # Check route kwargs ACL and convert the exceptions to responses the same way as the middleware does.
+        ContextMiddleware = apps.DjkAppConfig.get_context_middleware()
+        middleware = ContextMiddleware()
+        if middleware.is_our_module(match.func.__module__):
+            response = middleware.djk_view(request, match.func, match.args, dict(match.kwargs))
+        else:
+            response = match.func(request, *match.args, **match.kwargs)
+        if response is None or response.get('Content-Type', '').split(';')[0] != 'application/json':
+            return self.get_entry_error(
+                response.status_code if response is not None else 500,
+                format_html(_('Action "{}" response cannot be batched'), entry.get('action'))
+            )
+        return {
+            'status': response.status_code,
+            'headers': {header: response[header] for header in self.response_headers if response.has_header(header)},
+            'response': json.loads(response.content),
+        }
+
+    def post(self, request, *args, **kwargs):
+        return [self.perform_entry(entry) for entry in self.get_batch()]
+
+
 class ModelFormActionsView(ActionsView, FormViewmodelsMixin):
 
     context_object_name = 'model'
@@ -514,6 +636,8 @@ class GridActionsMixin(ModelFormActionsView):
     enable_deletion = False
     enable_rows_per_page = True
     enable_switch_highlight = True
+    enable_export = False
+    enable_autocomplete = False
     mark_safe_fields = None
     show_nested_fieldnames = True
     # Currently is used only to get verbose / localized foreign key field names and is not required to be filled.
@@ -524,9 +648,22 @@ class GridActionsMixin(ModelFormActionsView):
     # See also .get_related_model_fields_verbose_names() and GridColumnOrder.renderRowValue() implementations.
     related_models = None
     virtual_fields = None
+    # Set to True to cache 'meta' action viewmodel per view class, route kwargs, language and user permissions.
+    # Cached meta is served with ETag, client-side Grid revalidates it via If-None-Match request header.
+    # Override .get_meta_cache_fingerprint() when meta depends on other request data.
+    cache_meta = False
+    meta_cache_alias = DEFAULT_CACHE_ALIAS
+    meta_cache_timeout = 300
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
+        self.meta_etag = None
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if self.meta_etag is not None and not response.has_header('ETag'):
+            response['ETag'] = self.meta_etag
+        return response
 
     def get_enable_deletion(self):
         return self.enable_deletion
@@ -539,6 +676,9 @@ class GridActionsMixin(ModelFormActionsView):
                 ('list', {}),
                 ('update', {}),
                 ('meta_list', {}),
+                ('autocomplete', {
+                    'enabled': self.enable_autocomplete
+                }),
                 ('save_form', {}),
                 ('save_inline', {}),
                 ('delete_confirmed', {
@@ -590,6 +730,13 @@ class GridActionsMixin(ModelFormActionsView):
                         'iconui': 'iconui-th'
                     },
                     'enabled': self.enable_switch_highlight
+                }),
+                ('export', {
+                    'localName': _('Export'),
+                    'css': {
+                        'iconui': 'iconui-download'
+                    },
+                    'enabled': self.enable_export
                 })
             ]),
             'click': OrderedDict([
@@ -791,7 +938,64 @@ class GridActionsMixin(ModelFormActionsView):
 
         return meta
 
+    def get_meta_permissions_fingerprint(self, request=None):
+        user = getattr(self.request if request is None else request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return 'anonymous'
+        elif user.is_superuser:
+            return 'superuser'
+        else:
+            return sorted(user.get_all_permissions())
+
+    def get_meta_cache_fingerprint(self):
+        view_kwargs = {k: v for k, v in self.kwargs.items() if k != self.action_kwarg}
+        fingerprint = [
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            view_kwargs,
+            get_language(),
+            self.request_get(self.filter_key),
+            self.get_meta_permissions_fingerprint(),
+        ]
+        if self.facet_counts or self.range_stats:
+            # Facet counts / range stats of the filters depend on the search and on the current data.
+            fingerprint.extend([self.request_get(self.search_key), self.get_data_version()])
+        return fingerprint
+
+    def get_meta_cache_key(self):
+        fingerprint = tpl.to_json(self.get_meta_cache_fingerprint(), sort_keys=True)
+        return f'djk_grid_meta:{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}'
+
+    def get_cached_meta(self):
+        cache = caches[self.meta_cache_alias]
+        cache_key = self.get_meta_cache_key()
+        cached_meta = cache.get(cache_key)
+        if cached_meta is None:
+            vm = self.vm_get_meta()
+            etag = f'"{hashlib.sha1(tpl.to_json(vm, sort_keys=True).encode("utf-8")).hexdigest()}"'
+            cached_meta = (etag, vm)
+            cache.set(cache_key, cached_meta, self.meta_cache_timeout)
+        return cached_meta
+
+    def is_meta_not_modified(self):
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+        return if_none_match is not None and self.meta_etag in (etag.strip() for etag in if_none_match.split(','))
+
     def action_meta(self):
+        if not self.cache_meta:
+            return self.vm_get_meta()
+        self.meta_etag, vm = self.get_cached_meta()
+        if not self.preloading_meta_list and self.is_meta_not_modified():
+            if self.current_action_name == 'meta':
+                response = HttpResponseNotModified()
+                response['ETag'] = self.meta_etag
+                raise http.ImmediateHttpResponse(response)
+            else:
+                # 'meta_list' action: client-side Grid uses it's own copy of meta.
+                return {'metaNotModified': True}
+        return vm
+
+    def vm_get_meta(self):
         # self.get_filters may fail in case self.vm_get_grid_fields() is not called first.
         vm_grid_fields = self.vm_get_grid_fields()
         vm = {
@@ -806,7 +1010,16 @@ class GridActionsMixin(ModelFormActionsView):
             vm['markSafe'] = self.__class__.mark_safe_fields
         return vm
 
+    def is_list_unchanged(self):
+        if self.preloading_meta_list or self.current_action_name == 'meta_list':
+            return False
+        return self.request_get(self.version_key) == self.list_version
+
     def action_list(self):
+        if self.conditional_list:
+            self.list_version = self.get_list_version()
+            if self.is_list_unchanged():
+                return {'unchanged': True}
         rows, page_num, objects_per_page = self.get_rows()
         vm = {
             'entries': list(rows),
@@ -814,11 +1027,30 @@ class GridActionsMixin(ModelFormActionsView):
             'rowsPerPage': objects_per_page,
             'totalPages': ceil(self.total_rows / objects_per_page),
         }
+        if self.keyset_pagination:
+            # Opaque seek cursors of the adjacent pages, see KoGridView.get_keyset_cursors().
+            vm['cursors'] = self.page_cursors
+        if self.is_approximate_count:
+            vm['approximateTotalPages'] = True
+        if self.conditional_list:
+            vm['listVersion'] = self.list_version
+        if self.delta_update:
+            vm['deltaToken'] = self.dumps_delta(vm['entries'])
+        if self.facet_counts:
+            vm['facetCounts'] = self.vm_get_facet_counts()
+        if self.range_stats:
+            vm['rangeStats'] = self.get_range_stats()
         return vm
 
     def action_update(self):
         vm = self.action_list()
         vm['update'] = True
+        if self.delta_update and 'entries' in vm:
+            delta = self.get_delta(vm['entries'])
+            if delta is not None:
+                del vm['entries']
+                vm.update(delta)
+                vm['delta'] = True
         return vm
 
     def action_meta_list(self):
@@ -853,10 +1085,55 @@ class KoGridView(BaseFilterView, GridActionsMixin):
     min_objects_per_page = MIN_OBJECTS_PER_PAGE
     max_objects_per_page = MAX_OBJECTS_PER_PAGE
     objects_per_page = MIN_OBJECTS_PER_PAGE
+    # Set to True to seek the next / previous page via the cursor of the current sort order values instead of
+    # LIMIT / OFFSET, which becomes slow for the large tables. Other pages are still fetched via LIMIT / OFFSET.
+    keyset_pagination = False
+    cursor_key = 'list_cursor'
+    # Set to True to query the total rows count together with the page rows via COUNT(*) OVER () window function in one
+    # database round trip, when supported by the database backend. Empty pages fall back to .count_queryset().
+    window_count = False
+    window_count_field = 'djk_window_count'
+    # Set to True to serialize grid rows directly from queryset.values() without creating model instances.
+    # Used only when the model has no get_str_fields() method, .force_str_desc is False and .query_fields do not span
+    # reverse ForeignKey / ManyToManyField relations. .postprocess_row() receives obj=None in such case.
+    values_rows = False
+    # Set to True to respond to 'list' / 'update' actions with {'unchanged': True} viewmodel, when data version of the
+    # grid and the query arguments match the .version_key token of the previous response.
+    # Data version is Max() of .version_field with Count() of the filtered queryset when .version_field is set
+    # (for example DateTimeField with auto_now=True), otherwise per-model versions of the grid model and it's related
+    # models bumped by post_save / post_delete signals.
+    conditional_list = False
+    version_field = None
+    version_key = 'list_version'
+    # Set to True to respond to 'update' action with 'prepend_rows' / 'update_rows' / 'deleted_pks' of the current page
+    # changed since the client snapshot sent as .delta_key token, instead of the whole page.
+    delta_update = False
+    delta_key = 'list_delta'
+    # 'export' action (see .enable_export) streams the rows of the current filter / search / sort order.
+    # The first format is used by default.
+    export_formats = ('csv', 'ndjson')
+    export_content_types = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+    export_format_key = 'export_format'
+    export_chunk_size = 2000
+    # 'autocomplete' action (see .enable_autocomplete) returns at most .autocomplete_limit {'pk', '__str'} entries
+    # matching the search string, used by client-side FkGridFilter / FkGridWidget typeahead.
+    autocomplete_limit = 10
+    # Field lookup applied to all of search_fields by 'autocomplete' action, None to use the lookups of search_fields.
+    # Prefix lookups may use database index, for example PostgreSQL varchar_pattern_ops / Upper() index.
+    autocomplete_lookup = 'istartswith'
     force_str_desc = False
     # optional value of ko_grid() Jinja2 macro 'grid_options' argument.
     grid_options = None
     preload_meta_list = False
+    # Set to True to cache the result of .discover_grid_options() with nested 'fkGridOptions' per view class, route
+    # kwargs, template options, language and user permissions. Not used with .preload_meta_list.
+    # See also 'djk_warm_grid_options' management command.
+    cache_grid_options = False
+    grid_options_cache_alias = DEFAULT_CACHE_ALIAS
+    grid_options_cache_timeout = 3600
 
     # AJAX filters. See ListSortingView for traditional seriver-side version.
     def ioc_field_filter(self, fieldname, vm_filter):
@@ -877,7 +1154,8 @@ class KoGridView(BaseFilterView, GridActionsMixin):
     # It is possible to get related fields:
     # https://code.djangoproject.com/ticket/5768
     # https://github.com/django/django/commit/9b432cb67b
-    # Also, one may override self.get_base_queryset() to include .select_related() for performance optimization.
+    # Related objects of grid fields are queried via .select_related() / .prefetch_related() automatically,
+    # see BaseFilterView.related_queryset().
     def get_query_fields(self):
         all_related_fields = self.get_all_related_fields()
         # Do not return hidden field values to client-side response for better security.
@@ -896,12 +1174,57 @@ class KoGridView(BaseFilterView, GridActionsMixin):
         self.get_current_query()
         return self.action_meta_list()
 
+    def get_discovery_node(self):
+        return f'{self.__class__.__module__}.{self.__class__.__qualname__}'
+
+    def get_grid_options_cache_fingerprint(self, request, template_options, discovery_path):
+        return [
+            self.__class__.__module__,
+            self.__class__.__qualname__,
+            # Autodiscovered view is setup with the current request kwargs.
+            {} if request.resolver_match is None else request.resolver_match.kwargs,
+            template_options,
+            get_language(),
+            self.get_meta_permissions_fingerprint(request),
+            discovery_path,
+        ]
+
+    def get_grid_options_cache_key(self, request, template_options, discovery_path):
+        fingerprint = tpl.to_json(
+            self.get_grid_options_cache_fingerprint(request, template_options, discovery_path), sort_keys=True
+        )
+        return f'djk_grid_options:{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}'
+
+    # discovery_path is the tuple of the parent grid view classes, used to detect cyclic relations.
+    def discover_grid_options(self, request, template_options=None, discovery_path=()):
+        if template_options is None:
+            template_options = {}
+        # Preloaded meta list contains the rows, thus is not cached.
+        if not self.cache_grid_options or self.preload_meta_list:
+            return self.get_discovered_grid_options(request, template_options, discovery_path)
+        cache = caches[self.grid_options_cache_alias]
+        cache_key = self.get_grid_options_cache_key(request, template_options, discovery_path)
+        grid_options = cache.get(cache_key)
+        if grid_options is None:
+            grid_options = self.get_discovered_grid_options(request, template_options, discovery_path)
+            if not self.has_preloaded_meta_list(grid_options):
+                cache.set(cache_key, grid_options, self.grid_options_cache_timeout)
+        return grid_options
+
+    # Nested grids of 'fkGridOptions' may preload the rows as well.
+    def has_preloaded_meta_list(self, grid_options):
+        if 'preloadedMetaList' in grid_options:
+            return True
+        return any(
+            isinstance(fk_grid_options, dict) and self.has_preloaded_meta_list(fk_grid_options)
+            for fk_grid_options in grid_options.get('fkGridOptions', {}).values()
+        )
+
     # Automatically setup recusrive 'fkGridOptions' for nested BaseGridWidget relations.
     # It's more robust to setup 'fkGridOptions' manually, but it's much more cumbersome
     # in case grid has nested relations. Thus this method was introduced.
-    def discover_grid_options(self, request, template_options=None):
-        if template_options is None:
-            template_options = {}
+    def get_discovered_grid_options(self, request, template_options, discovery_path=()):
+        discovery_path = discovery_path + (self.get_discovery_node(),)
         grid_options = {
             'rowsPerPage': self.objects_per_page
         }
@@ -932,7 +1255,16 @@ class KoGridView(BaseFilterView, GridActionsMixin):
                         del field_fkGridOptions['type']
                     # Apply relations to fkGridOptions recursively.
                     related_view = related_view_cls(**related_view_kwargs)
-                    field_fkGridOptions.update(related_view.discover_grid_options(request))
+                    if related_view.get_discovery_node() in discovery_path:
+                        # Cyclic relation, for example self-referencing foreign key. Nested 'fkGridOptions' of the
+                        # already discovered grid should be specified in .get_grid_options(), when required.
+                        logger.warning(
+                            'Cyclic fkGridOptions discovery of %s field %s', self.__class__.__qualname__, filter_field
+                        )
+                    else:
+                        field_fkGridOptions.update(
+                            related_view.discover_grid_options(request, None, discovery_path)
+                        )
                     grid_options['fkGridOptions'][filter_field] = field_fkGridOptions
             if self.preload_meta_list:
                 grid_options['preloadedMetaList'] = self.get_preloaded_meta_list()
@@ -966,17 +1298,30 @@ class KoGridView(BaseFilterView, GridActionsMixin):
             else:
                 self.grid_fields_attnames.append(field_def)
 
+    setup_config_attrs = BaseFilterView.setup_config_attrs + ('virtual_fields', 'query_fields')
+    setup_config_methods = BaseFilterView.setup_config_methods + ('get_query_fields',)
+
+    def setup_config(self):
+        super().setup_config()
+        if self.query_fields is None:
+            self.query_fields = self.get_query_fields()
+
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.preloading_meta_list = False
-        if self.query_fields is None:
-            self.query_fields = self.get_query_fields()
 
     def get_filters(self):
         if not isinstance(self.allowed_filter_fields, OrderedDict):
             self.vm_error('KoGridView.allowed_filter_fields must be instance of OrderedDict')
         return super().get_filters()
 
+    # JSON object keys are strings, thus the counts of field values are converted to the lists of [value, count] pairs.
+    def vm_get_facet_counts(self):
+        return {
+            fieldname: [[value, count] for value, count in counts.items()]
+            for fieldname, counts in self.get_facet_counts().items()
+        }
+
     def get_related_fields(self, query_fields=None):
         query_fields = super().get_related_fields(query_fields)
         # Remove virtual fields from queryset values().
@@ -987,8 +1332,7 @@ class KoGridView(BaseFilterView, GridActionsMixin):
 
     def set_row_related_fields(self, row):
         row_related = {}
-        related_fields = self.get_related_fields()
-        for related_field in related_fields:
+        for related_field in self.get_row_plan().related_fields:
             row_related[related_field] = row.pop(related_field)
         for field, value in row_related.items():
             row[field] = value
@@ -1013,6 +1357,264 @@ class KoGridView(BaseFilterView, GridActionsMixin):
     def serialize_qs(self, qs, query_fields):
         return qs.values(*query_fields)
 
+    def can_values_rows(self):
+        if not self.values_rows or self.has_get_str_fields or self.__class__.force_str_desc:
+            return False
+        return not any(is_multivalued_path(self.model, fieldname) for fieldname in self.query_fields)
+
+    # Primary key is required for DISTINCT to match the rows of model instances queryset.
+    def get_values_rows_fields(self, keyset_order=None):
+        values_fields = list(self.query_fields)
+        extra_fields = [self.pk_field]
+        if keyset_order is not None:
+            extra_fields.extend(order.lstrip('-') for order in keyset_order)
+        for fieldname in extra_fields:
+            if fieldname not in values_fields:
+                values_fields.append(fieldname)
+        return values_fields
+
+    def get_values_row(self, values_row):
+        return {fieldname: values_row[fieldname] for fieldname in self.query_fields}
+
+    # Keyset (seek) pagination order: the actual order of the queryset with primary key as the unique tie-breaker.
+    # Returns None when the order cannot be used as the seek cursor (unordered queryset, ordering by annotations or
+    # expressions), thus LIMIT / OFFSET will be used instead.
+    def get_keyset_order(self, qs):
+        if not qs.ordered or qs.query.extra_order_by:
+            return None
+        if qs.query.order_by:
+            sort_order = qs.query.order_by
+        else:
+            sort_order = qs.query.get_meta().ordering
+        keyset_order = []
+        for order in sort_order:
+            if not isinstance(order, str) or order.lstrip('-') == '?' or order.lstrip('-') in qs.query.annotations:
+                return None
+            keyset_order.append(order)
+            if order.lstrip('-') in ('pk', self.pk_field):
+                return keyset_order
+        keyset_order.append(self.pk_field)
+        return keyset_order
+
+    def get_cursor_salt(self):
+        return f'{self.__class__.__module__}.{self.__class__.__name__}.{self.cursor_key}'
+
+    def dumps_cursor(self, cursor):
+        return signing.dumps(cursor, salt=self.get_cursor_salt(), serializer=CursorSerializer, compress=True)
+
+    def loads_cursor(self, token):
+        try:
+            return signing.loads(token, salt=self.get_cursor_salt(), serializer=CursorSerializer)
+        except (signing.BadSignature, ValueError):
+            return None
+
+    # Cursor is valid only for the same sort order / page size and the page it was issued for.
+    # Filters / search are not part of the cursor: client-side Grid drops the cursor when these are changed.
+    def get_request_cursor(self, keyset_order, page_num, objects_per_page):
+        token = self.request_get(self.cursor_key)
+        if not token:
+            return None
+        cursor = self.loads_cursor(token)
+        if not isinstance(cursor, dict):
+            return None
+        if cursor.get('order') != keyset_order or cursor.get('page') != page_num or \
+                cursor.get('rows_per_page') != objects_per_page or cursor.get('direction') not in ('next', 'prev'):
+            return None
+        return cursor
+
+    def get_keyset_q(self, keyset_order, values, is_reverse=False):
+        # (a > 1) OR (a = 1 AND b < 2) OR (a = 1 AND b = 2 AND pk > 3) for order_by('a', '-b', 'pk').
+        q = None
+        eq_kwargs = {}
+        for order, value in zip(keyset_order, values):
+            fieldname = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') is not is_reverse else 'gt'
+            seek_q = models.Q(**eq_kwargs, **{f'{fieldname}__{lookup}': value})
+            q = seek_q if q is None else q | seek_q
+            eq_kwargs[fieldname] = value
+        return q
+
+    def get_keyset_page(self, qs, keyset_order, cursor, objects_per_page):
+        is_reverse = cursor['direction'] == 'prev'
+        if is_reverse:
+            qs_order = [order.lstrip('-') if order.startswith('-') else f'-{order}' for order in keyset_order]
+        else:
+            qs_order = keyset_order
+        paginated_qs = qs.filter(
+            self.get_keyset_q(keyset_order, cursor['values'], is_reverse)
+        ).order_by(*qs_order)[:objects_per_page]
+        return ListQuerySet(reversed(paginated_qs) if is_reverse else paginated_qs)
+
+    def get_keyset_values(self, keyset_order, obj):
+        values = []
+        for order in keyset_order:
+            fieldname = order.lstrip('-')
+            if isinstance(obj, dict):
+                value = obj[fieldname]
+            elif fieldname == 'pk':
+                value = obj.pk
+            else:
+                value = get_related_field_val(obj, fieldname, strict_related=False)
+            if value is None:
+                # NULL values ordering is backend-specific thus cannot be seeked.
+                return None
+            values.append(value.pk if isinstance(value, models.Model) else value)
+        return values
+
+    def get_keyset_cursor(self, keyset_order, obj, direction, page_num, objects_per_page):
+        values = self.get_keyset_values(keyset_order, obj)
+        if values is None:
+            return None
+        return self.dumps_cursor({
+            'order': keyset_order,
+            'values': values,
+            'direction': direction,
+            'page': page_num,
+            'rows_per_page': objects_per_page,
+        })
+
+    def get_keyset_cursors(self, keyset_order, paginated_qs, page_num, objects_per_page):
+        cursors = {}
+        if keyset_order is None or len(paginated_qs) == 0:
+            return cursors
+        if page_num > 1:
+            cursors['prev'] = self.get_keyset_cursor(
+                keyset_order, paginated_qs.first(), 'prev', page_num - 1, objects_per_page
+            )
+        if page_num * objects_per_page < self.total_rows:
+            cursors['next'] = self.get_keyset_cursor(
+                keyset_order, paginated_qs.last(), 'next', page_num + 1, objects_per_page
+            )
+        return cursors
+
+    def can_window_count(self, qs):
+        if not self.window_count or not connections[qs.db].features.supports_over_clause:
+            return False
+        if qs.query.distinct_fields:
+            return False
+        # Window function is evaluated before DISTINCT, thus it counts the duplicate rows of multi-valued joins.
+        return not qs.query.distinct or not has_multivalued_joins(qs)
+
+    # Sliced page queryset. Sets self.total_rows when the count was queried together with the page rows.
+    def get_page_qs(self, qs, first_elem, last_elem):
+        if first_elem == last_elem or not self.can_window_count(qs):
+            return ListQuerySet(qs[first_elem:last_elem])
+        paginated_qs = ListQuerySet(
+            qs.annotate(**{
+                self.window_count_field: models.Window(expression=models.Count('*'))
+            })[first_elem:last_elem]
+        )
+        if len(paginated_qs) > 0:
+            first_row = paginated_qs.first()
+            self.total_rows = first_row[self.window_count_field] if isinstance(first_row, dict) else \
+                getattr(first_row, self.window_count_field)
+            self.is_approximate_count = False
+        return paginated_qs
+
+    # Grid model with the related models of grid fields.
+    def get_version_models(self):
+        version_models = {self.model}
+        for fieldname in self.grid_fields_attnames:
+            model = self.model
+            for _fieldname in fieldname.split('__'):
+                try:
+                    field = model._meta.get_field(_fieldname)
+                except FieldDoesNotExist:
+                    break
+                if field.related_model is None:
+                    break
+                model = field.related_model
+                version_models.add(model)
+        return sorted(version_models, key=lambda model: model._meta.label_lower)
+
+    def get_data_version(self):
+        if self.version_field is None:
+            return [get_model_version(model) for model in self.get_version_models()]
+        aggregates = self.get_queryset().order_by().aggregate(
+            version_max=models.Max(self.version_field), version_count=models.Count('pk')
+        )
+        return [aggregates['version_max'], aggregates['version_count']]
+
+    def get_list_version_args(self):
+        query = self.request.POST if self.request.method == 'POST' else self.request.GET
+        view_kwargs = {k: v for k, v in self.kwargs.items() if k != self.action_kwarg}
+        skip_keys = ('csrfmiddlewaretoken', self.version_key, self.delta_key, self.cursor_key)
+        query_args = {
+            key: query.getlist(key) for key in query.keys() if key not in skip_keys
+        }
+        return [view_kwargs, query_args]
+
+    # Opaque token of the current data version and query arguments, see .conditional_list.
+    def get_list_version(self):
+        version = tpl.to_json([self.get_data_version(), self.get_list_version_args()], sort_keys=True)
+        return hashlib.sha1(version.encode('utf-8')).hexdigest()
+
+    def get_delta_salt(self):
+        return f'{self.__class__.__module__}.{self.__class__.__name__}.{self.delta_key}'
+
+    def get_delta_args_hash(self):
+        return hashlib.sha1(
+            tpl.to_json(self.get_list_version_args(), sort_keys=True).encode('utf-8')
+        ).hexdigest()
+
+    # Primary key value as it is seen by client-side Grid.
+    def get_row_pk_val(self, row):
+        return json.loads(tpl.to_json(row[self.pk_field]))
+
+    def get_row_hash(self, row):
+        return hashlib.sha1(tpl.to_json(row, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    # Snapshot of the page rows: query arguments with the ordered list of primary keys / row hashes.
+    def dumps_delta(self, rows):
+        return signing.dumps({
+            'args': self.get_delta_args_hash(),
+            'rows': [[self.get_row_pk_val(row), self.get_row_hash(row)] for row in rows],
+        }, salt=self.get_delta_salt(), serializer=CursorSerializer, compress=True)
+
+    def loads_delta(self):
+        token = self.request_get(self.delta_key)
+        if not token:
+            return None
+        try:
+            snapshot = signing.loads(token, salt=self.get_delta_salt(), serializer=CursorSerializer)
+        except (signing.BadSignature, ValueError):
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get('args') != self.get_delta_args_hash():
+            return None
+        return snapshot
+
+    # Returns None when the delta cannot be applied by client-side Grid.updatePage(), thus the whole page is sent.
+    def get_delta(self, rows):
+        snapshot = self.loads_delta()
+        if snapshot is None:
+            return None
+        old_hashes = {pk_val: row_hash for pk_val, row_hash in snapshot['rows']}
+        new_pk_vals = [self.get_row_pk_val(row) for row in rows]
+        prepend_rows = []
+        update_rows = []
+        kept_pk_vals = []
+        for row, pk_val in zip(rows, new_pk_vals):
+            if pk_val not in old_hashes:
+                if len(kept_pk_vals) > 0:
+                    # Inserted row is not at the top of the page.
+                    return None
+                prepend_rows.append(row)
+            else:
+                kept_pk_vals.append(pk_val)
+                if self.get_row_hash(row) != old_hashes[pk_val]:
+                    update_rows.append(row)
+        new_pk_vals_set = set(new_pk_vals)
+        old_kept_pk_vals = [pk_val for pk_val, row_hash in snapshot['rows'] if pk_val in new_pk_vals_set]
+        if old_kept_pk_vals != kept_pk_vals:
+            # Rows order was changed.
+            return None
+        return {
+            # Grid.addKoRows() unshifts the rows one by one.
+            'prepend_rows': list(reversed(prepend_rows)),
+            'update_rows': update_rows,
+            'deleted_pks': [pk_val for pk_val, row_hash in snapshot['rows'] if pk_val not in new_pk_vals_set],
+        }
+
     def get_rows(self):
         kw = {
             'minval': self.min_objects_per_page,
@@ -1037,17 +1639,126 @@ class KoGridView(BaseFilterView, GridActionsMixin):
         else:
             page_num = first_elem = last_elem = 0
         qs = self.get_queryset()
-        self.total_rows = qs.count()
-        paginated_qs = ListQuerySet(qs[first_elem:last_elem])
-        paginated_qs_iter = paginated_qs.__iter__()
-        rows = [
-            self.postprocess_row(
-                self.set_row_related_fields(row), next(paginated_qs_iter)
-            )
-            for row in self.serialize_qs(paginated_qs, self.query_fields)
-        ]
+        self.total_rows = None
+        keyset_order = self.get_keyset_order(qs) if self.keyset_pagination else None
+        is_values_rows = self.can_values_rows()
+        if is_values_rows:
+            qs = qs.values(*self.get_values_rows_fields(keyset_order))
+        if self.keyset_pagination:
+            cursor = None if keyset_order is None or objects_per_page != prev_objects_per_page else \
+                self.get_request_cursor(keyset_order, page_num, objects_per_page)
+            if cursor is None:
+                paginated_qs = self.get_page_qs(qs, first_elem, last_elem)
+            else:
+                paginated_qs = self.get_keyset_page(qs, keyset_order, cursor, objects_per_page)
+        else:
+            paginated_qs = self.get_page_qs(qs, first_elem, last_elem)
+        if self.total_rows is None:
+            self.total_rows = self.count_queryset(qs)
+        if self.keyset_pagination:
+            self.page_cursors = self.get_keyset_cursors(keyset_order, paginated_qs, page_num, objects_per_page)
+        if is_values_rows:
+            rows = [
+                self.postprocess_row(
+                    self.set_row_related_fields(self.get_values_row(values_row)), None
+                )
+                for values_row in paginated_qs
+            ]
+        else:
+            paginated_qs_iter = paginated_qs.__iter__()
+            rows = [
+                self.postprocess_row(
+                    self.set_row_related_fields(row), next(paginated_qs_iter)
+                )
+                for row in self.serialize_qs(paginated_qs, self.query_fields)
+            ]
         return rows, page_num, objects_per_page
 
+    def iter_export_rows(self, qs):
+        if self.can_values_rows():
+            values_qs = qs.values(*self.get_values_rows_fields())
+            for values_row in values_qs.iterator(chunk_size=self.export_chunk_size):
+                yield self.postprocess_row(
+                    self.set_row_related_fields(self.get_values_row(values_row)), None
+                )
+        else:
+            for obj in qs.iterator(chunk_size=self.export_chunk_size):
+                yield self.postprocess_row(
+                    self.set_row_related_fields(self.get_model_row(obj)), obj
+                )
+
+    def get_export_fields(self):
+        return [fieldname for fieldname in self.grid_fields_attnames if fieldname in self.query_fields]
+
+    # Prefer display value of get_str_fields(), when available.
+    def get_export_csv_value(self, row, fieldname):
+        str_value = row.get('__str_fields', {}).get(fieldname)
+        if isinstance(str_value, str):
+            return str_value
+        value = row.get(fieldname)
+        return '' if value is None else value
+
+    def iter_export_csv(self, rows):
+        writer = csv.writer(EchoBuffer())
+        export_fields = self.get_export_fields()
+        yield writer.writerow([self.get_field_verbose_name(fieldname) for fieldname in export_fields])
+        for row in rows:
+            yield writer.writerow([self.get_export_csv_value(row, fieldname) for fieldname in export_fields])
+
+    def iter_export_ndjson(self, rows):
+        for row in rows:
+            yield tpl.to_json(row) + '\n'
+
+    def get_export_filename(self, export_format):
+        return f'{self.model._meta.model_name}.{export_format}'
+
+    def action_export(self):
+        export_format = self.request_get(self.export_format_key, self.export_formats[0])
+        if export_format not in self.export_formats:
+            self.report_error('Unsupported export format: "{}"', export_format)
+        # Populates self.field_names used for CSV header.
+        self.vm_get_grid_fields()
+        # Filter / search / sort errors are reported before the streaming is started.
+        qs = self.get_queryset()
+        response = StreamingHttpResponse(
+            getattr(self, f'iter_export_{export_format}')(self.iter_export_rows(qs)),
+            content_type=self.export_content_types.get(export_format, 'application/octet-stream')
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.get_export_filename(export_format)}"'
+        return response
+
+    def get_autocomplete_search_fields(self):
+        if self.autocomplete_lookup is None:
+            return self.search_fields
+        return [(field, self.autocomplete_lookup) for field, operation in sdv.yield_ordered(self.search_fields)]
+
+    # Unlike .get_queryset(), does not query the related objects of grid fields.
+    def get_autocomplete_queryset(self):
+        self.get_current_query()
+        queryset = self.get_base_queryset()
+        search_fields = self.get_autocomplete_search_fields()
+        if self.current_search_str != '' and len(search_fields) > 0:
+            queryset = self.ioc_search_backend().search(queryset, search_fields, self.current_search_str)
+        try:
+            return self.distinct_queryset(self.order_queryset(self.filter_queryset(queryset)))
+        except FieldError as e:
+            self.report_error(str(e))
+
+    def get_autocomplete_entry(self, obj):
+        return {
+            'pk': obj.pk,
+            '__str': str(obj),
+        }
+
+    def action_autocomplete(self):
+        objects = list(self.get_autocomplete_queryset()[:self.autocomplete_limit + 1])
+        return {
+            # Allows the client to skip the responses of outdated search strings.
+            'search': self.current_search_str,
+            'entries': [self.get_autocomplete_entry(obj) for obj in objects[:self.autocomplete_limit]],
+            'hasMore': len(objects) > self.autocomplete_limit,
+        }
+
     def postprocess_qs(self, qs):
         return [
             self.postprocess_row(self.get_model_row(obj), obj) for obj in qs
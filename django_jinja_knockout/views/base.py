@@ -1,14 +1,20 @@
+import hashlib
 import json
+import logging
+import threading
 from collections import OrderedDict
-from functools import wraps
+from copy import copy
+from functools import lru_cache, wraps
 from urllib.parse import urlparse
 from ensure import ensure_annotations
 
-from django.core.exceptions import ValidationError, FieldError
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from django.core.exceptions import EmptyResultSet, ValidationError, FieldError
 from django.conf import settings
 from django.template.response import TemplateResponse
 from django.utils.html import format_html, escape
-from django.utils.translation import gettext as _
+from django.utils import timezone
+from django.utils.translation import gettext as _, get_language
 from django.utils.decorators import method_decorator
 from django.db import models
 from django.views.generic.base import ContextMixin, TemplateResponseMixin, View
@@ -20,14 +26,20 @@ from ..context_processors import create_page_context
 from .. import http
 from .. import tpl
 from ..models import (
-    normalize_fk_fieldname, get_verbose_name, get_related_field_val, yield_model_fieldnames
+    normalize_fk_fieldname, get_verbose_name, get_related_field_val, yield_model_fieldnames, get_related_lookups,
+    is_multivalued_path, get_model_version
 )
 from ..obj_dict import ObjDict
+from ..query import QuerySetCounter, has_multivalued_joins
+from ..search import IcontainsSearch
 from ..viewmodels import vm_list
 from ..utils.sdv import yield_ordered, get_nested, FuncArgs
 from ..forms.validators import FieldValidator
 
 
+logger = logging.getLogger(__name__)
+
+
 def page_context_decorator(view_title=None, client_data=None, client_routes=None, custom_scripts=None):
     def decorator(func):
         @wraps(func)
@@ -403,6 +415,18 @@ class FormViewmodelsMixin(ViewmodelView):
         return ff_vms
 
 
+# Grid rows serialization field lists, compiled once per view setup.
+class RowPlan:
+
+    def __init__(self, view):
+        self.exclude_fields = frozenset(view.exclude_fields)
+        # Grid fields that span relationships with their pre-split relation paths.
+        self.str_field_paths = tuple(
+            (fieldname, tuple(fieldname.split('__'))) for fieldname in view.grid_fields_attnames if '__' in fieldname
+        )
+        self.related_fields = tuple(view.get_related_fields())
+
+
 # Model queryset filtering / ordering base.
 class BaseFilterView(PageContextMixin):
 
@@ -410,6 +434,49 @@ class BaseFilterView(PageContextMixin):
     order_key = 'list_order_by'
     search_key = 'list_search'
     field_validator = FieldValidator
+    # Total rows count strategy: QuerySetCounter (exact), CachedQuerySetCounter, EstimatedQuerySetCounter
+    # from django_jinja_knockout.query or custom class that implements .count(qs) / .is_approximate.
+    queryset_counter = QuerySetCounter
+    # Search strategy: IcontainsSearch (OR of search_fields lookups), PostgresSearch, SqliteFtsSearch
+    # from django_jinja_knockout.search or custom class that implements .search(queryset, search_fields, search_str).
+    search_backend = IcontainsSearch
+    # Request independent configuration computed by .setup_config() is cached per view class.
+    # None value enables the cache only when the view class does not override .setup_config_methods, thus the
+    # configuration cannot depend on request / view kwargs. Override .get_setup_cache_key() to include such kwargs.
+    cache_setup = None
+    setup_config_attrs = (
+        'pk_field', 'grid_fields', 'exclude_fields', 'grid_fields_attnames', 'allowed_sort_orders',
+        'allowed_filter_fields', 'search_fields', 'has_get_str_fields',
+    )
+    setup_config_methods = (
+        '__init__', 'setup', 'setup_config', 'get_grid_fields', 'get_exclude_fields', 'yield_fields',
+        'yield_fields_attnames', 'get_grid_fields_attnames', 'set_grid_fields', 'get_allowed_sort_orders',
+        'get_all_allowed_sort_orders', 'get_allowed_filter_fields', 'get_search_fields', 'get_all_fieldnames',
+        'get_related_fields', 'get_all_related_fields',
+    )
+    setup_config_cache = {}
+    # LRU cache of validated list filters, used only together with the setup configuration cache. Set to 0 to disable.
+    list_filter_cache_size = 256
+    list_filter_cache = OrderedDict()
+    list_filter_cache_lock = threading.Lock()
+    list_filter_methods = (
+        'get_current_list_filter', 'get_current_list_filter_multiple', 'get_field_validator', 'get_q_or',
+    )
+    list_filter_method_prefixes = ('get_scalar_lookup_', 'get_list_lookup_')
+    # Set to False to disable automatic select_related() / prefetch_related() of the relations spanned by grid fields.
+    infer_related = True
+    # Set to True to add the number of rows to the choices of 'choices' filters.
+    facet_counts = False
+    facet_count_alias = 'facet_count'
+    facet_cache_alias = DEFAULT_CACHE_ALIAS
+    facet_cache_timeout = 30
+    # Set to True to add the bounds of field values to 'number' / 'date' / 'datetime' range filters.
+    # Cached with the facet_cache_alias / facet_cache_timeout of facet counts.
+    range_stats = False
+    range_filter_types = ('number', 'date', 'datetime')
+    range_stats_alias = 'range_stats'
+    # Number of histogram buckets of range filters, 0 to query the bounds only.
+    range_histogram_buckets = 0
 
     # List of grid columns. Use '__all__' value to display all model fields as grid columns,
     # or specify the list of field names:
@@ -447,6 +514,10 @@ class BaseFilterView(PageContextMixin):
         self.allowed_filter_fields = None
         self.search_fields = None
         self.has_get_str_fields = False
+        self.is_approximate_count = False
+        self.row_plan = None
+        self.current_facet_counts = None
+        self.current_range_stats = None
 
     # yields flattened fields from possibly nested .grid_fields (optional compound columns)
     def yield_fields(self):
@@ -569,28 +640,73 @@ class BaseFilterView(PageContextMixin):
         if self.has_get_str_fields:
             str_fields = OrderedDict()
             user = getattr(self.request, 'user', None)
+            row_plan = self.get_row_plan()
             for fieldname, v in ObjDict.from_obj(obj=obj, request_user=user).get_str_fields().items():
-                if fieldname not in self.exclude_fields:
+                if fieldname not in row_plan.exclude_fields:
                     str_fields[fieldname] = v
-            for fieldname in self.grid_fields_attnames:
-                if '__' in fieldname:
-                    rel_path = fieldname.split('__')
-                    rel_str = get_nested(str_fields, rel_path)
-                    if rel_str is not None:
-                        str_fields[fieldname] = rel_str
+            for fieldname, rel_path in row_plan.str_field_paths:
+                rel_str = get_nested(str_fields, rel_path)
+                if rel_str is not None:
+                    str_fields[fieldname] = rel_str
             return str_fields
         else:
             return {}
 
-    def setup(self, request, *args, **kwargs):
-        super().setup(request, *args, **kwargs)
-
+    @classmethod
+    @lru_cache(maxsize=None)
+    def has_custom_setup_config(cls):
+        for method_name in cls.setup_config_methods:
+            method = getattr(cls, method_name, None)
+            if method is not None and not getattr(method, '__module__', '').startswith('django_jinja_knockout.'):
+                return True
+        return False
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def has_custom_list_filter(cls):
+        for method_name in dir(cls):
+            if method_name in cls.list_filter_methods or method_name.startswith(cls.list_filter_method_prefixes):
+                method = getattr(cls, method_name)
+                if not getattr(method, '__module__', '').startswith('django_jinja_knockout.'):
+                    return True
+        return False
+
+    # Return None to disable the cache of .setup_config() attributes.
+    def get_setup_cache_key(self):
+        if self.cache_setup is False or (self.cache_setup is None and self.has_custom_setup_config()):
+            return None
+        return self.__class__
+
+    def setup_config(self):
         for field in self.model._meta.fields:
             if field.primary_key:
                 self.pk_field = field.attname
                 break
 
         self.grid_fields = self.get_grid_fields()
+        self.exclude_fields = self.get_exclude_fields()
+        self.set_grid_fields()
+        self.allowed_sort_orders = self.get_allowed_sort_orders()
+        self.allowed_filter_fields = self.get_allowed_filter_fields()
+        self.search_fields = self.get_search_fields()
+
+        self.has_get_str_fields = hasattr(self.model, 'get_str_fields')
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+
+        cache_key = self.get_setup_cache_key()
+        setup_config = None if cache_key is None else self.setup_config_cache.get(cache_key)
+        if setup_config is None:
+            self.setup_config()
+            if cache_key is not None:
+                self.setup_config_cache[cache_key] = {
+                    attr: copy(getattr(self, attr)) for attr in self.setup_config_attrs
+                }
+        else:
+            # Shallow copies, so the instance may alter the lists / dicts without affecting the cache.
+            for attr, value in setup_config.items():
+                setattr(self, attr, copy(value))
 
         list_filter_str = self.request_get(self.filter_key)
         if list_filter_str is not None:
@@ -603,13 +719,15 @@ class BaseFilterView(PageContextMixin):
                     'Invalid value of list filter: {}', list_filter_str
                 )
 
-        self.exclude_fields = self.get_exclude_fields()
-        self.set_grid_fields()
-        self.allowed_sort_orders = self.get_allowed_sort_orders()
-        self.allowed_filter_fields = self.get_allowed_filter_fields()
-        self.search_fields = self.get_search_fields()
+        self.row_plan = None
 
-        self.has_get_str_fields = hasattr(self.model, 'get_str_fields')
+    def ioc_row_plan(self):
+        return RowPlan(self)
+
+    def get_row_plan(self):
+        if self.row_plan is None:
+            self.row_plan = self.ioc_row_plan()
+        return self.row_plan
 
     def get_field_verbose_name(self, field_name):
         if field_name in self.field_names:
@@ -670,6 +788,8 @@ class BaseFilterView(PageContextMixin):
                     })
                 else:
                     vm_filter.update(vm_filter_autodetect)
+        if self.range_stats and vm_filter['type'] in self.range_filter_types:
+            vm_filter['stats'] = self.get_range_stats().get(fieldname)
         field_filter = self.ioc_field_filter(fieldname, vm_filter)
         return self.build_field_filter(field_filter, canon_filter_def)
 
@@ -799,6 +919,47 @@ class BaseFilterView(PageContextMixin):
                 current_list_filter.add(sub_filter)
         return current_list_filter
 
+    # Validated filter depends on the allowed filter fields, on the current locale (numbers / dates parsing) and
+    # timezone. Return None to disable the cache.
+    def get_list_filter_cache_key(self, request_list_filter):
+        if self.list_filter_cache_size == 0 or len(request_list_filter) == 0 or \
+                not self.field_validator.cache_prototype or self.has_custom_list_filter():
+            return None
+        setup_cache_key = self.get_setup_cache_key()
+        if setup_cache_key is None:
+            return None
+        return (
+            setup_cache_key,
+            json.dumps(request_list_filter, sort_keys=True),
+            get_language(),
+            timezone.get_current_timezone_name(),
+        )
+
+    # Override to skip caching of partially valid filter.
+    def is_list_filter_cacheable(self, current_list_filter):
+        return True
+
+    def get_cached_list_filter(self, request_list_filter):
+        cache_key = self.get_list_filter_cache_key(request_list_filter)
+        if cache_key is None:
+            return self.get_current_list_filter(request_list_filter)
+        with self.list_filter_cache_lock:
+            cached_list_filter = self.list_filter_cache.get(cache_key)
+            if cached_list_filter is not None:
+                self.list_filter_cache.move_to_end(cache_key)
+        if cached_list_filter is None:
+            # Invalid filter raises an exception, thus is not cached.
+            current_list_filter = self.get_current_list_filter(request_list_filter)
+            if not self.is_list_filter_cacheable(current_list_filter):
+                return current_list_filter
+            cached_list_filter = FuncArgs(*current_list_filter.args, **current_list_filter.kwargs)
+            with self.list_filter_cache_lock:
+                self.list_filter_cache[cache_key] = cached_list_filter
+                while len(self.list_filter_cache) > self.list_filter_cache_size:
+                    self.list_filter_cache.popitem(last=False)
+        # The instance may alter the filter, see ListSortingView.remove_query_filter().
+        return FuncArgs(*cached_list_filter.args, **cached_list_filter.kwargs)
+
     def get_current_query(self):
         sort_order = self.request_get(self.order_key)
         if sort_order is not None:
@@ -813,7 +974,7 @@ class BaseFilterView(PageContextMixin):
             self.current_stripped_sort_order = self.strip_sort_order(sort_order)
             self.current_sort_order = sort_order
 
-        self.current_list_filter = self.get_current_list_filter(self.request_list_filter)
+        self.current_list_filter = self.get_cached_list_filter(self.request_list_filter)
 
         self.current_search_str = self.request_get(self.search_key, '')
 
@@ -837,31 +998,258 @@ class BaseFilterView(PageContextMixin):
     def filter_queryset(self, queryset):
         return self.current_list_filter.apply(queryset.filter)
 
+    def ioc_search_backend(self):
+        return self.search_backend()
+
     def search_queryset(self, queryset):
         if self.current_search_str == '' or len(self.search_fields) == 0:
             return queryset
         else:
-            q = None
+            return self.ioc_search_backend().search(queryset, self.search_fields, self.current_search_str)
+
+    def yield_filter_lookups(self, filter_args):
+        for arg in filter_args:
+            if isinstance(arg, models.Q):
+                yield from self.yield_filter_lookups(arg.children)
+            elif isinstance(arg, tuple):
+                yield arg[0]
+
+    # Yields lookup paths of the current filter, search and sort order.
+    def yield_query_lookups(self):
+        yield from self.yield_filter_lookups(self.current_list_filter.args)
+        yield from self.current_list_filter.kwargs.keys()
+        if self.current_search_str != '':
             for field, operation in yield_ordered(self.search_fields):
-                if operation != '':
-                    field += '__' + operation
-                q_kwargs = {
-                    field: self.current_search_str
-                }
-                if q is None:
-                    q = models.Q(**q_kwargs)
-                else:
-                    q |= models.Q(**q_kwargs)
-            return queryset.filter(q)
+                yield field
+        if self.current_sort_order is not None:
+            for order in self.current_sort_order:
+                if isinstance(order, str):
+                    yield order.lstrip('-')
+
+    # The rows may be duplicated only when the queryset joins reverse ForeignKey / ManyToManyField relations, including
+    # the joins of the base queryset.
+    def is_distinct_required(self, queryset):
+        if not isinstance(queryset, models.QuerySet):
+            return True
+        return has_multivalued_joins(queryset, compile=False) or any(
+            is_multivalued_path(self.model, lookup) for lookup in self.yield_query_lookups()
+        )
 
     def distinct_queryset(self, queryset):
-        return queryset.distinct()
+        if self.is_distinct_required(queryset):
+            return queryset.distinct()
+        else:
+            return queryset
 
     # This method is required because child class custom queryset.filter will not work after self.order_queryset().
     # Thus, filter ListView queryset by overriding this method, not get_queryset().
     def get_base_queryset(self):
         return super().get_queryset()
 
+    # Returns sorted select_related() / prefetch_related() lookups of the relations spanned by grid fields, to avoid
+    # N+1 queries of the related objects during row serialization / display.
+    def get_related_lookups(self):
+        select_related = set()
+        prefetch_related = set()
+        for fieldname in self.grid_fields_attnames:
+            select_path, prefetch_path = get_related_lookups(self.model, fieldname)
+            if select_path != '':
+                select_related.add(select_path)
+            if prefetch_path is not None:
+                prefetch_related.add(prefetch_path)
+        return sorted(select_related), sorted(prefetch_related)
+
+    def related_queryset(self, queryset):
+        # Raw / list / values querysets do not support related objects querying.
+        if not self.infer_related or not isinstance(queryset, models.QuerySet) or queryset._fields is not None:
+            return queryset
+        select_related, prefetch_related = self.get_related_lookups()
+        logger.debug(
+            '%s inferred select_related=%r prefetch_related=%r',
+            self.__class__.__name__, select_related, prefetch_related
+        )
+        if len(select_related) > 0:
+            queryset = queryset.select_related(*select_related)
+        if len(prefetch_related) > 0:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+    def ioc_queryset_counter(self):
+        return self.queryset_counter()
+
+    # DISTINCT of all selected columns is replaced by DISTINCT of primary key, unless the queryset is grouped.
+    def get_count_queryset(self, queryset):
+        if not isinstance(queryset, models.QuerySet):
+            return queryset
+        query = queryset.query
+        if not query.distinct or query.distinct_fields or query.is_sliced or query.combinator or \
+                query.group_by is not None or \
+                any(getattr(annotation, 'contains_aggregate', False) for annotation in query.annotations.values()):
+            return queryset
+        return queryset.order_by().values('pk').distinct()
+
+    def count_queryset(self, queryset):
+        counter = self.ioc_queryset_counter()
+        total = counter.count(self.get_count_queryset(queryset))
+        self.is_approximate_count = counter.is_approximate
+        return total
+
+    # Returns the type of filter of the field without building the filter, None when the type cannot be detected.
+    def get_filter_type(self, fieldname):
+        filter_def = self.allowed_filter_fields[fieldname]
+        if isinstance(filter_def, (list, tuple)):
+            return 'choices'
+        canon_filter_def = dict(filter_def) if isinstance(filter_def, dict) else {}
+        if canon_filter_def.get('type') is not None:
+            return canon_filter_def['type']
+        if isinstance(canon_filter_def.get('choices'), (list, tuple)):
+            return 'choices'
+        vm_filter_autodetect = self.get_field_validator(fieldname).detect_field_filter(canon_filter_def)
+        return vm_filter_autodetect['type'] if isinstance(vm_filter_autodetect, dict) else None
+
+    def is_facet_field(self, fieldname):
+        return self.get_filter_type(fieldname) == 'choices'
+
+    def get_facet_fields(self):
+        return [fieldname for fieldname in self.allowed_filter_fields if self.is_facet_field(fieldname)]
+
+    def get_facet_base_queryset(self):
+        return self.get_base_queryset()
+
+    # Rows matching the current search and filter, except the filter of the facet field itself, so the counts
+    # show the number of rows for each choice of the field.
+    def get_facet_queryset(self, fieldname):
+        request_list_filter = {
+            filter_field: values for filter_field, values in self.request_list_filter.items()
+            if filter_field != fieldname
+        }
+        list_filter = self.get_cached_list_filter(request_list_filter)
+        queryset = list_filter.apply(self.search_queryset(self.get_facet_base_queryset()).filter)
+        return queryset.order_by().values(fieldname).annotate(**{
+            self.facet_count_alias: models.Count('pk', distinct=self.is_distinct_required(queryset))
+        })
+
+    def get_facet_cache_key(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        key_hash = hashlib.sha1(json.dumps(
+            [queryset.db, sql, [str(param) for param in params]]
+        ).encode('utf-8')).hexdigest()
+        model_version = get_model_version(queryset.model)
+        return f'djk_facets:{queryset.model._meta.label_lower}:{model_version}:{key_hash}'
+
+    def count_facet(self, fieldname):
+        queryset = self.get_facet_queryset(fieldname)
+        if not isinstance(queryset, models.QuerySet):
+            return {row[fieldname]: row[self.facet_count_alias] for row in queryset}
+        try:
+            cache_key = self.get_facet_cache_key(queryset)
+        except EmptyResultSet:
+            return {}
+        cache = caches[self.facet_cache_alias]
+        facet_counts = cache.get(cache_key)
+        if facet_counts is None:
+            facet_counts = [(row[fieldname], row[self.facet_count_alias]) for row in queryset]
+            cache.set(cache_key, facet_counts, self.facet_cache_timeout)
+        return dict(facet_counts)
+
+    # Returns dict of facet field names / dicts of field value: rows count, computed once per request.
+    def get_facet_counts(self):
+        if self.current_facet_counts is None:
+            self.current_facet_counts = {
+                fieldname: self.count_facet(fieldname) for fieldname in self.get_facet_fields()
+            } if self.facet_counts else {}
+        return self.current_facet_counts
+
+    def get_facet_count(self, fieldname, value):
+        return self.get_facet_counts().get(fieldname, {}).get(value, 0)
+
+    def is_range_field(self, fieldname):
+        return self.get_filter_type(fieldname) in self.range_filter_types
+
+    def get_range_fields(self):
+        return [fieldname for fieldname in self.allowed_filter_fields if self.is_range_field(fieldname)]
+
+    # Rows matching the current search and the filters of non-range fields, so the bounds do not shrink to the
+    # currently selected ranges.
+    def get_range_queryset(self, range_fields):
+        request_list_filter = {
+            filter_field: values for filter_field, values in self.request_list_filter.items()
+            if filter_field not in range_fields
+        }
+        list_filter = self.get_cached_list_filter(request_list_filter)
+        return list_filter.apply(self.search_queryset(self.get_facet_base_queryset()).filter).order_by()
+
+    # Lower bound of each of range_histogram_buckets intervals of equal width. The last interval includes max_val.
+    def get_range_bucket_bounds(self, min_val, max_val):
+        step = (max_val - min_val) / self.range_histogram_buckets
+        return [min_val] + [min_val + step * i for i in range(1, self.range_histogram_buckets)] + [max_val]
+
+    def get_range_bucket_q(self, fieldname, bounds, i):
+        q_kwargs = {f'{fieldname}__gte': bounds[i]}
+        if i == len(bounds) - 2:
+            q_kwargs[f'{fieldname}__lte'] = bounds[i + 1]
+        else:
+            q_kwargs[f'{fieldname}__lt'] = bounds[i + 1]
+        return models.Q(**q_kwargs)
+
+    # One aggregate query for the bounds of all range fields and one more for the histograms, when enabled.
+    def aggregate_range_stats(self, queryset, range_fields):
+        distinct = self.is_distinct_required(queryset)
+        aggregates = {}
+        for i, fieldname in enumerate(range_fields):
+            aggregates[f'{self.range_stats_alias}_min_{i}'] = models.Min(fieldname)
+            aggregates[f'{self.range_stats_alias}_max_{i}'] = models.Max(fieldname)
+        bounds_row = queryset.aggregate(**aggregates)
+        range_stats = {}
+        histogram_aggregates = {}
+        all_bounds = {}
+        for i, fieldname in enumerate(range_fields):
+            min_val = bounds_row[f'{self.range_stats_alias}_min_{i}']
+            max_val = bounds_row[f'{self.range_stats_alias}_max_{i}']
+            range_stats[fieldname] = {
+                'min': min_val,
+                'max': max_val,
+            }
+            if self.range_histogram_buckets > 0 and min_val is not None:
+                all_bounds[fieldname] = self.get_range_bucket_bounds(min_val, max_val)
+                for j in range(self.range_histogram_buckets):
+                    histogram_aggregates[f'{self.range_stats_alias}_{i}_{j}'] = models.Count(
+                        'pk', distinct=distinct, filter=self.get_range_bucket_q(fieldname, all_bounds[fieldname], j)
+                    )
+        if len(histogram_aggregates) > 0:
+            histogram_row = queryset.aggregate(**histogram_aggregates)
+            for i, fieldname in enumerate(range_fields):
+                if fieldname in all_bounds:
+                    bounds = all_bounds[fieldname]
+                    range_stats[fieldname]['histogram'] = [
+                        [bounds[j], bounds[j + 1], histogram_row[f'{self.range_stats_alias}_{i}_{j}']]
+                        for j in range(self.range_histogram_buckets)
+                    ]
+        return range_stats
+
+    def count_range_stats(self, range_fields):
+        queryset = self.get_range_queryset(range_fields)
+        if not isinstance(queryset, models.QuerySet):
+            return {}
+        try:
+            cache_key = f'{self.get_facet_cache_key(queryset.values(*range_fields))}:{self.range_histogram_buckets}'
+        except EmptyResultSet:
+            return {fieldname: {'min': None, 'max': None} for fieldname in range_fields}
+        cache = caches[self.facet_cache_alias]
+        range_stats = cache.get(cache_key)
+        if range_stats is None:
+            range_stats = self.aggregate_range_stats(queryset, range_fields)
+            cache.set(cache_key, range_stats, self.facet_cache_timeout)
+        return range_stats
+
+    # Returns dict of range filter field names / dicts of 'min', 'max' and optional 'histogram' list of
+    # [from, to, count] buckets, computed once per request.
+    def get_range_stats(self):
+        if self.current_range_stats is None:
+            range_fields = self.get_range_fields() if self.range_stats else []
+            self.current_range_stats = self.count_range_stats(range_fields) if len(range_fields) > 0 else {}
+        return self.current_range_stats
+
     def get_queryset(self):
         self.get_current_query()
         try:
@@ -870,7 +1258,9 @@ class BaseFilterView(PageContextMixin):
                     self.order_queryset(
                         self.filter_queryset(
                             self.search_queryset(
-                                self.get_base_queryset()
+                                self.related_queryset(
+                                    self.get_base_queryset()
+                                )
                             )
                         )
                     )
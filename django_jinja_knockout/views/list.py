@@ -3,7 +3,9 @@ import json
 
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.core.paginator import Paginator
 from django.utils.encoding import force_str
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.forms.utils import flatatt
 from django.utils.translation import gettext as _
@@ -75,12 +77,27 @@ class FoldingPaginationMixin(ContextMixin):
         return context_data
 
 
+# Counts paginated rows via BaseFilterView.count_queryset() to support cached / estimated total rows count.
+class FilterViewPaginator(Paginator):
+
+    def __init__(self, object_list, per_page, view=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.view = view
+
+    @cached_property
+    def count(self):
+        if self.view is None:
+            return super().count
+        return self.view.count_queryset(self.object_list)
+
+
 # Traditional server-side (non-AJAX) generated filtered / sorted ListView.
 # todo: Implement more filters ('range', 'fk').
 # todo: Support self.current_list_filter.args Q() __or__.
 class ListSortingView(UiListSortingView, FoldingPaginationMixin, BaseFilterView, ListView):
 
     paginate_by = getattr(settings, 'OBJECTS_PER_PAGE', 10)
+    paginator_class = FilterViewPaginator
     template_name = 'cbv_list.htm'
     data_caption = True
 
@@ -386,6 +403,10 @@ class ListSortingView(UiListSortingView, FoldingPaginationMixin, BaseFilterView,
             }
         })
 
+    # Facet counts are rendered by the filters, thus the validation of filters by .get_base_queryset() is skipped.
+    def get_facet_base_queryset(self):
+        return super().get_base_queryset()
+
     def get_base_queryset(self):
         # Validate all filters by calling .get_template_kwargs() which would remove invalid lookups from
         # via .remove_query_filter() method so these will not be queried.
@@ -394,7 +415,17 @@ class ListSortingView(UiListSortingView, FoldingPaginationMixin, BaseFilterView,
             field_filter.get_template_kwargs()
         return super().get_base_queryset()
 
+    def is_list_filter_cacheable(self, current_list_filter):
+        return len(self.filter_errors) == 0
+
     def get_current_query(self):
         super().get_current_query()
         if len(self.filter_errors) > 0:
             self.report_error()
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        if issubclass(self.paginator_class, FilterViewPaginator):
+            kwargs['view'] = self
+        return super().get_paginator(
+            queryset, per_page, orphans=orphans, allow_empty_first_page=allow_empty_first_page, **kwargs
+        )
@@ -246,11 +246,60 @@ class DisplayText(RequestWidget):
             return self.render_scalar(final_attrs, value, display_values[0])
 
 
+# Per-request state shared by BaseGridWidget instances, stored as the request attribute.
+# Widgets with the same fkGridOptions and view kwargs share one setup of the related grid view and it's grid options.
+# The initial rows of the widget values registered via .add_pending() (see prefetch_grid_widgets()) are loaded with one
+# pk__in query per grid view.
+class GridWidgetBatch:
+
+    request_attr = 'djk_grid_widget_batch'
+
+    @classmethod
+    def get(cls, request):
+        batch = getattr(request, cls.request_attr, None)
+        if batch is None:
+            batch = cls(request)
+            setattr(request, cls.request_attr, batch)
+        return batch
+
+    def __init__(self, request):
+        self.request = request
+        self.views = {}
+        self.pending_pks = {}
+        self.rows = {}
+
+    def get_view(self, key, fk_grid_options, view_kwargs):
+        if key not in self.views:
+            widget_view_cls, widget_view_kwargs = resolve_grid(request=self.request, view_options=fk_grid_options)
+            widget_view = widget_view_cls(**widget_view_kwargs)
+            grid_options = widget_view.discover_grid_options(self.request, fk_grid_options)
+            widget_view.setup(self.request, **view_kwargs)
+            self.views[key] = (widget_view, grid_options)
+        return self.views[key]
+
+    def add_pending(self, key, pks):
+        self.pending_pks.setdefault(key, set()).update(str(pk) for pk in pks)
+
+    # Returns the rows of pks in the same order, skipping the missing ones.
+    def get_rows(self, key, widget, pks):
+        widget_view, grid_options = self.views[key]
+        rows = self.rows.setdefault(key, {})
+        self.add_pending(key, pks)
+        pending_pks = [pk for pk in self.pending_pks.pop(key) if pk not in rows]
+        if len(pending_pks) > 0:
+            objects = list(widget.get_batch_fk_grid_queryset(widget_view, pending_pks))
+            for obj, row in zip(objects, widget_view.postprocess_qs(objects)):
+                rows[str(obj.pk)] = row
+        return [rows[str(pk)] for pk in pks if str(pk) in rows]
+
+
 class BaseGridWidget(UiBaseGridWidget, RequestWidget):
 
     allow_multiple_selected = None
     required = None
     template_options = None
+    # Set to False to query the initial rows of each widget separately via .get_initial_fk_grid_queryset().
+    batch_initial_rows = True
 
     def __init__(self, attrs=None, grid_options=None, widget_view_kwargs=None):
         if grid_options is None:
@@ -268,9 +317,41 @@ class BaseGridWidget(UiBaseGridWidget, RequestWidget):
         self.component_options = {'fkGridOptions': deepcopy(grid_options)}
         super().__init__(attrs=attrs)
 
+    # Widget.__deepcopy__() copies only .attrs, while .component_options are updated by .get_context().
+    def __deepcopy__(self, memo):
+        obj = super().__deepcopy__(memo)
+        obj.component_options = deepcopy(self.component_options, memo)
+        return obj
+
     def get_initial_fk_grid_queryset(self, widget_view, value):
         raise NotImplementedError
 
+    def get_batch_fk_grid_queryset(self, widget_view, pks):
+        filter_kwargs = {
+            widget_view.pk_field + '__in': pks
+        }
+        return widget_view.get_base_queryset().filter(**filter_kwargs)
+
+    # Custom .get_initial_fk_grid_queryset() is not batched.
+    def can_batch_initial_rows(self):
+        return self.batch_initial_rows and \
+            type(self).get_initial_fk_grid_queryset.__module__.startswith('django_jinja_knockout.')
+
+    def get_value_pks(self, value):
+        pks = value if isinstance(value, (list, tuple)) else [value]
+        return [pk for pk in pks if pk not in (None, '')]
+
+    def get_batch_key(self):
+        return to_json([self.component_options['fkGridOptions'], self.get_widget_view_kwargs()], sort_keys=True)
+
+    def add_pending(self, value):
+        if value is None or isinstance(value, (QuerySet, RawQuerySet, ListQuerySet)):
+            return
+        if not self.can_batch_initial_rows():
+            return
+        self.request = self.get_request()
+        GridWidgetBatch.get(self.request).add_pending(self.get_batch_key(), self.get_value_pks(value))
+
     def get_component_attrs(self):
         component_attrs = {
             'class': 'component',
@@ -301,26 +382,23 @@ class BaseGridWidget(UiBaseGridWidget, RequestWidget):
 
         # Autodetect foreign key widgets fkGridOptions.
         self.request = self.get_request()
-        widget_view_cls, widget_view_kwargs = resolve_grid(
-            request=self.request,
-            view_options=self.component_options['fkGridOptions']
-        )
-        widget_view = widget_view_cls(**widget_view_kwargs)
-        foreign_key_grid_options = widget_view.discover_grid_options(
-            self.request, self.component_options['fkGridOptions']
+        batch = GridWidgetBatch.get(self.request)
+        batch_key = self.get_batch_key()
+        widget_view, grid_options = batch.get_view(
+            batch_key, self.component_options['fkGridOptions'], self.get_widget_view_kwargs()
         )
+        foreign_key_grid_options = deepcopy(grid_options)
         foreign_key_grid_options['selectMultipleRows'] = self.allow_multiple_selected
-        widget_view.setup(self.request, **self.get_widget_view_kwargs())
         foreign_key_grid_options['pkField'] = widget_view.pk_field
 
         if value is None:
             initial_fk_rows = []
+        elif isinstance(value, (QuerySet, RawQuerySet, ListQuerySet)):
+            initial_fk_rows = widget_view.postprocess_qs(value)
+        elif self.can_batch_initial_rows():
+            initial_fk_rows = batch.get_rows(batch_key, self, self.get_value_pks(value))
         else:
-            if isinstance(value, (QuerySet, RawQuerySet, ListQuerySet)):
-                fk_qs = value
-            else:
-                fk_qs = self.get_initial_fk_grid_queryset(widget_view, value)
-            initial_fk_rows = widget_view.postprocess_qs(fk_qs)
+            initial_fk_rows = widget_view.postprocess_qs(self.get_initial_fk_grid_queryset(widget_view, value))
 
         self.component_options.update({
             'attrs': widget_ctx['attrs'],
@@ -343,6 +421,14 @@ class BaseGridWidget(UiBaseGridWidget, RequestWidget):
         return result
 
 
+# Registers the values of BaseGridWidget fields of the forms, so the initial rows of the widgets are loaded in batches.
+def prefetch_grid_widgets(forms):
+    for form in forms:
+        for bound_field in form:
+            if isinstance(bound_field.field.widget, BaseGridWidget):
+                bound_field.field.widget.add_pending(bound_field.value())
+
+
 #  Similar to django.admin FilteredSelectMultiple but is Knockout.js driven.
 class MultipleKeyGridWidget(BaseGridWidget):
 